@@ -68,7 +68,7 @@ class DatabaseQueryAgent:
         
         # Register database tool - tracing is handled in DatabaseTool.execute_query()
         @self.agent.tool
-        def query_database(ctx: RunContext[DatabaseQueryDeps], sql_query: str) -> DatabaseResult:
+        async def query_database(ctx: RunContext[DatabaseQueryDeps], sql_query: str) -> DatabaseResult:
             """
             Execute a SQL query against the database and return results.
             
@@ -79,7 +79,7 @@ class DatabaseQueryAgent:
                 DatabaseResult with query results or error information
             """
             db_query = DatabaseQuery(query=sql_query)
-            return ctx.deps.db_tool.execute_query(db_query)
+            return await ctx.deps.db_tool.aexecute_query(db_query)
         
         # Register schema loading tools (always register, but check for None in implementation)
         @self.agent.tool
@@ -35,6 +35,7 @@ from app.agents.planner_agent import PlannerAgent
 from app.agents.database_query_agent import DatabaseQueryAgent
 from app.agents.synthesizer_agent import SynthesizerAgent
 from app.agents.plot_planning_agent import PlotPlanningAgent
+from app.db.manager import DatabaseManager
 from app.utils.session_manager import SessionManager
 from app.utils.message_history import MessageHistoryManager
 from app.utils.routing import Router
@@ -57,12 +58,17 @@ class OrchestratorAgent:
     4. SynthesizerAgent: Takes agent output (or user question for general questions) and creates final user-facing response with plots if needed
     """
 
-    def __init__(self, instructions: str = "Be helpful and concise."):
+    def __init__(
+        self,
+        instructions: str = "Be helpful and concise.",
+        db_manager: Optional[DatabaseManager] = None,
+    ):
         """
         Initialize all agents in the orchestration pipeline.
 
         Args:
             instructions: Base system instructions (currently unused, kept for compatibility)
+            db_manager: Optional app database for persisting session state across restarts
         """
         self.db_tool = DatabaseTool()
 
@@ -142,7 +148,7 @@ class OrchestratorAgent:
         )
 
         # Initialize utilities
-        self.session_manager = SessionManager()
+        self.session_manager = SessionManager(db_manager)
         self.message_history_manager = MessageHistoryManager(summarizer_agent)
         self.router = Router(self.database_query_agent)
         self.clarification_handler = ClarificationHandler(self.message_history_manager)
@@ -261,8 +267,9 @@ class OrchestratorAgent:
         Returns:
             Tuple of (session_id, session_state, current_message_history)
         """
-        # Get or create session state
+        # Get or create session state (restoring persisted state off the event loop)
         session_id = user_input.session_id or "default"
+        await self.session_manager.load_session(session_id)
         session_state = self.session_manager.get_or_create_session(
             session_id, message_history
         )
@@ -395,15 +402,10 @@ class OrchestratorAgent:
                     ).hexdigest()[:8]
                     timestamp = str(int(time.time()))
                     cache_key = f"{query_hash}_{timestamp}"
+                    # Stored once; it becomes the session's latest result (also reachable as 'latest')
                     self.session_manager.store_query_result(
                         session_id, cache_key, agent_output
                     )
-                    # Also store as 'latest' for easy access
-                    self.session_manager.store_query_result(
-                        session_id, "latest", agent_output
-                    )
-                    # Clear old results (keep last 5)
-                    self.session_manager.clear_old_results(session_id, keep_last_n=5)
 
         return agent_output
 
@@ -490,6 +492,21 @@ class OrchestratorAgent:
         Returns:
             The agent's response as an AgentResponse model
         """
+        try:
+            return await self._run_chat(user_input, message_history, cancellation_event)
+        finally:
+            # Persist the session once per turn (history and cached results) in the background
+            self.session_manager.schedule_save(user_input.session_id or "default")
+            # Write the tags gathered during this turn to the trace in a single update
+            self.trace_manager.flush_tags()
+
+    async def _run_chat(
+        self,
+        user_input: UserMessage,
+        message_history: Optional[List[ModelMessage]] = None,
+        cancellation_event: Optional[asyncio.Event] = None,
+    ) -> AgentResponse:
+        """Run the orchestration flow for chat(), inside its trace."""
         # Check for cancellation before starting
         self._check_cancellation(cancellation_event)
         
@@ -582,3 +599,5 @@ class OrchestratorAgent:
             self.session_manager.reset_session(session_id)
         else:
             self.session_manager.reset_all_sessions()
+        # Drop cached query results so the next question is answered from current data
+        self.router.clear_cache()
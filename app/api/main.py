@@ -8,8 +8,7 @@ import uuid
 import json
 import logging
 from dotenv import load_dotenv
-from typing import Optional, List
-from pydantic_ai import ModelMessage, UserPromptPart, TextPart, ModelRequest, ModelResponse
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +35,7 @@ from app.db.manager import DatabaseManager
 from app.agents.orchestrator import OrchestratorAgent
 from app.core.models import UserMessage
 from app.utils.plot_generator import _make_json_serializable
+from app.utils.message_history import messages_from_chat_history
 load_dotenv()
 
 # Configure logging to see logs in console
@@ -75,7 +75,8 @@ ensure_admin_user(db)
 
 # Initialize orchestrator agent
 orchestrator = OrchestratorAgent(
-    instructions='Be helpful and concise.'
+    instructions='Be helpful and concise.',
+    db_manager=db
 )
 
 # Cancellation manager to track active requests per chat session
@@ -152,29 +153,6 @@ async def login(request: LoginRequest):
     )
 
 
-def _convert_history_to_messages(history: List[dict]) -> List[ModelMessage]:
-    """
-    Convert database chat history to pydantic_ai ModelMessage format.
-    
-    Args:
-        history: List of chat message dicts from database
-        
-    Returns:
-        List of ModelMessage objects
-    """
-    messages = []
-    for msg in history:
-        # Add user message
-        user_msg = ModelRequest(parts=[UserPromptPart(content=msg["message"])])
-        messages.append(user_msg)
-        
-        # Add assistant response
-        assistant_msg = ModelResponse(parts=[TextPart(content=msg["response"])])
-        messages.append(assistant_msg)
-    
-    return messages
-
-
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
@@ -203,7 +181,7 @@ async def chat(
     
     # Load conversation history from database for this chat session
     history = db.get_chat_history(current_user["id"], request.chat_session_id)
-    message_history = _convert_history_to_messages(history) if history else None
+    message_history = messages_from_chat_history(history) if history else None
     
     # Create user message with session_id and username
     user_message = UserMessage(
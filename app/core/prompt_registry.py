@@ -1,6 +1,6 @@
 """Prompt registry utility for managing MLflow prompts with fallback support."""
 import logging
-from typing import Optional, Dict
+from typing import Optional, Dict, Set
 import mlflow
 from mlflow.tracking import MlflowClient
 from app.core.models import DatabasePack
@@ -209,27 +209,51 @@ class PromptRegistry:
     def __init__(self):
         """Initialize the prompt registry."""
         self._client: Optional[MlflowClient] = None
+        # Names of prompts registered in MLflow, fetched on first existence check
+        self._registered_names: Optional[Set[str]] = None
         try:
             self._client = MlflowClient()
         except Exception as e:
             logger.warning(f"Failed to initialize MLflow client: {e}. Will use fallback prompts.")
     
+    def _get_registered_names(self) -> Set[str]:
+        """
+        Get the names of all prompts registered in MLflow (fetched once, then cached).
+        
+        Returns:
+            Set of registered prompt names
+        """
+        if self._registered_names is None:
+            names: Set[str] = set()
+            page_token = None
+            while True:
+                page = self._client.search_prompts(max_results=1000, page_token=page_token)
+                names.update(prompt.name for prompt in page)
+                page_token = page.token
+                if not page_token:
+                    break
+            self._registered_names = names
+        return self._registered_names
+    
     def _prompt_exists(self, name: str) -> bool:
         """
         Check if a prompt exists in MLflow registry.
         
+        One search lists every registered prompt on the first call; later checks are
+        set lookups instead of a template download per prompt.
+        
         Args:
             name: Prompt name to check
             
         Returns:
             True if prompt exists, False otherwise
         """
+        if self._client is None:
+            return False
         try:
-            # Try to load the prompt - if it exists, this will succeed
-            mlflow.genai.load_prompt(f"prompts:/{name}@latest")
-            return True
+            return name in self._get_registered_names()
         except Exception:
-            # Prompt doesn't exist or MLflow is unavailable
+            # MLflow is unavailable
             return False
     
     def register_prompt_if_missing(
@@ -262,6 +286,8 @@ class PromptRegistry:
                     commit_message=commit_message,
                     tags=tags or {}
                 )
+                if self._registered_names is not None:
+                    self._registered_names.add(name)
                 if force_update:
                     logger.info(f"Updated prompt '{name}' in MLflow with new version.")
                 else:
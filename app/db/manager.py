@@ -2,7 +2,7 @@
 import sqlite3
 import logging
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 from datetime import datetime, timedelta
 import json
 
@@ -373,7 +373,7 @@ class DatabaseManager:
             SELECT id, user_id, chat_session_id, message, response, intent_type, metadata, created_at
             FROM chat_messages
             WHERE user_id = ? AND chat_session_id = ?
-            ORDER BY created_at ASC
+            ORDER BY created_at ASC, id ASC
         """
         
         if limit:
@@ -427,4 +427,99 @@ class DatabaseManager:
         conn.commit()
         conn.close()
         return deleted_count
-
+    
+    # Orchestrator session state operations
+    def save_orchestrator_session(
+        self,
+        session_id: str,
+        message_history: str,
+        cached_query_results: Sequence[Tuple[str, bytes, bool]],
+        latest_key: Optional[str] = None
+    ) -> None:
+        """
+        Insert or replace the persisted state of an orchestrator session.
+        
+        Args:
+            session_id: Orchestrator session identifier
+            message_history: Serialized message history (JSON)
+            cached_query_results: (key, payload, compressed) per cached query result, oldest first;
+                payload is the result's JSON, zlib-compressed when compressed is True
+            latest_key: Key of the most recently stored query result
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """INSERT INTO orchestrator_sessions (session_id, message_history, latest_key, updated_at)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT(session_id) DO UPDATE SET
+                   message_history = excluded.message_history,
+                   latest_key = excluded.latest_key,
+                   updated_at = excluded.updated_at""",
+            (session_id, message_history, latest_key, datetime.now().isoformat())
+        )
+        cursor.execute("DELETE FROM orchestrator_session_results WHERE session_id = ?", (session_id,))
+        cursor.executemany(
+            """INSERT INTO orchestrator_session_results (session_id, position, result_key, payload, compressed)
+               VALUES (?, ?, ?, ?, ?)""",
+            [
+                (session_id, position, key, payload, int(compressed))
+                for position, (key, payload, compressed) in enumerate(cached_query_results)
+            ]
+        )
+        conn.commit()
+        conn.close()
+    
+    def get_orchestrator_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the persisted state of an orchestrator session.
+        
+        Args:
+            session_id: Orchestrator session identifier
+            
+        Returns:
+            Dict with serialized message_history, cached_query_results as a list of
+            (key, payload, compressed) tuples (oldest first) and latest_key, or None if not found
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT message_history, latest_key FROM orchestrator_sessions WHERE session_id = ?",
+            (session_id,)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            conn.close()
+            return None
+        cursor.execute(
+            """SELECT result_key, payload, compressed
+               FROM orchestrator_session_results
+               WHERE session_id = ?
+               ORDER BY position""",
+            (session_id,)
+        )
+        results = [(r["result_key"], r["payload"], bool(r["compressed"])) for r in cursor.fetchall()]
+        conn.close()
+        
+        return {
+            "message_history": row["message_history"],
+            "cached_query_results": results,
+            "latest_key": row["latest_key"]
+        }
+    
+    def delete_orchestrator_session(self, session_id: Optional[str] = None) -> None:
+        """
+        Delete persisted orchestrator session state.
+        
+        Args:
+            session_id: Orchestrator session identifier. If None, deletes all sessions.
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        if session_id is None:
+            cursor.execute("DELETE FROM orchestrator_session_results")
+            cursor.execute("DELETE FROM orchestrator_sessions")
+        else:
+            cursor.execute("DELETE FROM orchestrator_session_results WHERE session_id = ?", (session_id,))
+            cursor.execute("DELETE FROM orchestrator_sessions WHERE session_id = ?", (session_id,))
+        conn.commit()
+        conn.close()
@@ -15,6 +15,9 @@ def create_schema(db_path: Path) -> None:
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
+    # WAL lets session state writes proceed without blocking concurrent readers
+    cursor.execute("PRAGMA journal_mode=WAL")
+    
     # Users table
     # Note: SQLite doesn't support ALTER COLUMN, so for existing databases with NOT NULL,
     # we'll handle password_hash as optional in the application code
@@ -67,6 +70,30 @@ def create_schema(db_path: Path) -> None:
         )
     """)
     
+    # Orchestrator session state (message history as JSON), persisted so conversations
+    # survive restarts and in-memory LRU eviction
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS orchestrator_sessions (
+            session_id TEXT PRIMARY KEY,
+            message_history TEXT,
+            latest_key TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
+    # Cached query results of orchestrator sessions, oldest first; large results are
+    # stored zlib-compressed exactly as held in memory
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS orchestrator_session_results (
+            session_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            result_key TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            compressed INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (session_id, position)
+        )
+    """)
+    
     # Create indexes for better query performance
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions(user_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_token ON sessions(token)")
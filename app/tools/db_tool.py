@@ -1,4 +1,5 @@
 """Database tool for executing SQL queries with typed inputs and outputs."""
+import asyncio
 from pathlib import Path
 from typing import Optional
 import sqlite3
@@ -119,4 +120,18 @@ class DatabaseTool:
                 error=f"Unexpected error: {str(e)}",
                 row_count=0
             )
+    
+    async def aexecute_query(self, query: DatabaseQuery) -> DatabaseResult:
+        """
+        Execute a SQL query in a worker thread so the event loop keeps serving other sessions.
+        
+        Each call opens its own connection, so concurrent queries from different threads are safe.
+        
+        Args:
+            query: DatabaseQuery model containing SQL query and parameters
+            
+        Returns:
+            DatabaseResult model with query results or error information
+        """
+        return await asyncio.to_thread(self.execute_query, query)
 
@@ -1,11 +1,57 @@
 """Message history management for orchestrator."""
-from typing import List
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 from pydantic_ai import ModelMessage, ModelRequest, ModelResponse, UserPromptPart, TextPart, SystemPromptPart, Agent
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_created_at(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a chat message's created_at column (SQLite CURRENT_TIMESTAMP, UTC).
+    
+    Args:
+        value: Stored timestamp string
+        
+    Returns:
+        Timezone-aware datetime, or None if missing or unparseable
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def messages_from_chat_history(history: List[Dict[str, Any]]) -> List[ModelMessage]:
+    """
+    Convert database chat history to pydantic_ai ModelMessage format.
+    
+    Messages take their timestamps from the stored rows rather than the load time, so the
+    same chat history always converts to the same messages.
+    
+    Args:
+        history: List of chat message dicts from database (oldest first)
+        
+    Returns:
+        List of ModelMessage objects, a user request and an assistant response per row
+    """
+    messages: List[ModelMessage] = []
+    for msg in history:
+        timestamp = _parse_created_at(msg.get("created_at"))
+        if timestamp is None:
+            messages.append(ModelRequest(parts=[UserPromptPart(content=msg["message"])]))
+            messages.append(ModelResponse(parts=[TextPart(content=msg["response"])]))
+        else:
+            messages.append(ModelRequest(
+                parts=[UserPromptPart(content=msg["message"], timestamp=timestamp)],
+                timestamp=timestamp
+            ))
+            messages.append(ModelResponse(parts=[TextPart(content=msg["response"])], timestamp=timestamp))
+    return messages
+
+
 class MessageHistoryManager:
     """Manages message history summarization and updates."""
     
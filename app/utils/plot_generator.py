@@ -1,10 +1,14 @@
 """Plot generation utility using Plotly to create interactive charts."""
+import base64
+import gc
 import logging
 import re
 import json
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple, Callable, Iterable
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
 from app.core.models import PlotConfig
 
 logger = logging.getLogger(__name__)
@@ -23,141 +27,356 @@ EXECUTIVE_COLORS = [
     '#17becf',  # Cyan
 ]
 
-def _get_executive_layout(title: Optional[str] = None, xaxis_title: Optional[str] = None, yaxis_title: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Get executive-friendly layout configuration for Plotly charts.
-    
-    Args:
-        title: Chart title
-        xaxis_title: X-axis title
-        yaxis_title: Y-axis title
-    
-    Returns:
-        Layout dictionary with professional styling
-    """
-    layout = {
+# Per-color trace style dicts, built once and shared (read-only) between figures
+_COLOR_MARKERS = tuple({"color": c} for c in EXECUTIVE_COLORS)
+_LINE_STYLES = tuple({"color": c, "width": 2.5} for c in EXECUTIVE_COLORS)
+_LINE_MARKER = {"size": 6}
+_SCATTER_MARKERS = tuple({"color": c, "size": 8, "opacity": 0.7} for c in EXECUTIVE_COLORS)
+
+# Constant portion of the executive layout; only the title texts vary per plot
+_LAYOUT_TEMPLATE: Dict[str, Any] = {
+    "title": {
+        "text": "",
+        "font": {
+            "size": 20,
+            "family": "Arial, sans-serif",
+            "color": "#2c3e50"
+        },
+        "x": 0.5,
+        "xanchor": "center"
+    },
+    "font": {
+        "family": "Arial, sans-serif",
+        "size": 14,
+        "color": "#2c3e50"
+    },
+    "plot_bgcolor": "white",
+    "paper_bgcolor": "white",
+    "margin": {
+        "l": 80,
+        "r": 50,
+        "t": 80,
+        "b": 80
+    },
+    "xaxis": {
+        "title": {
+            "text": "",
+            "font": {
+                "size": 16,
+                "family": "Arial, sans-serif",
+                "color": "#2c3e50"
+            }
+        },
+        "showgrid": True,
+        "gridcolor": "#e0e0e0",
+        "gridwidth": 1,
+        "zeroline": False,
+        "linecolor": "#b0b0b0",
+        "linewidth": 1
+    },
+    "yaxis": {
         "title": {
-            "text": title or "",
+            "text": "",
             "font": {
-                "size": 20,
+                "size": 16,
                 "family": "Arial, sans-serif",
                 "color": "#2c3e50"
-            },
-            "x": 0.5,
-            "xanchor": "center"
+            }
         },
+        "showgrid": True,
+        "gridcolor": "#e0e0e0",
+        "gridwidth": 1,
+        "zeroline": False,
+        "linecolor": "#b0b0b0",
+        "linewidth": 1
+    },
+    "legend": {
         "font": {
-            "family": "Arial, sans-serif",
             "size": 14,
+            "family": "Arial, sans-serif",
             "color": "#2c3e50"
         },
-        "plot_bgcolor": "white",
-        "paper_bgcolor": "white",
-        "margin": {
-            "l": 80,
-            "r": 50,
-            "t": 80,
-            "b": 80
-        },
+        "bgcolor": "rgba(255, 255, 255, 0.8)",
+        "bordercolor": "#e0e0e0",
+        "borderwidth": 1
+    },
+    "hovermode": "closest",
+    "width": 800,
+    "height": 500
+}
+
+
+@lru_cache(maxsize=256)
+def _layout_for(title: str, xaxis_title: str, yaxis_title: str) -> Dict[str, Any]:
+    """Build the executive layout for a (title, x, y) combination, sharing the constant sub-dicts."""
+    return {
+        **_LAYOUT_TEMPLATE,
+        "title": {**_LAYOUT_TEMPLATE["title"], "text": title},
         "xaxis": {
-            "title": {
-                "text": xaxis_title or "",
-                "font": {
-                    "size": 16,
-                    "family": "Arial, sans-serif",
-                    "color": "#2c3e50"
-                }
-            },
-            "showgrid": True,
-            "gridcolor": "#e0e0e0",
-            "gridwidth": 1,
-            "zeroline": False,
-            "linecolor": "#b0b0b0",
-            "linewidth": 1
+            **_LAYOUT_TEMPLATE["xaxis"],
+            "title": {**_LAYOUT_TEMPLATE["xaxis"]["title"], "text": xaxis_title}
         },
         "yaxis": {
-            "title": {
-                "text": yaxis_title or "",
-                "font": {
-                    "size": 16,
-                    "family": "Arial, sans-serif",
-                    "color": "#2c3e50"
-                }
-            },
-            "showgrid": True,
-            "gridcolor": "#e0e0e0",
-            "gridwidth": 1,
-            "zeroline": False,
-            "linecolor": "#b0b0b0",
-            "linewidth": 1
-        },
-        "legend": {
-            "font": {
-                "size": 14,
-                "family": "Arial, sans-serif",
-                "color": "#2c3e50"
-            },
-            "bgcolor": "rgba(255, 255, 255, 0.8)",
-            "bordercolor": "#e0e0e0",
-            "borderwidth": 1
+            **_LAYOUT_TEMPLATE["yaxis"],
+            "title": {**_LAYOUT_TEMPLATE["yaxis"]["title"], "text": yaxis_title}
         },
-        "hovermode": "closest",
-        "width": 800,
-        "height": 500
     }
-    return layout
+
+
+def _get_executive_layout(title: Optional[str] = None, xaxis_title: Optional[str] = None, yaxis_title: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get executive-friendly layout configuration for Plotly charts.
+    
+    Args:
+        title: Chart title
+        xaxis_title: X-axis title
+        yaxis_title: Y-axis title
+    
+    Returns:
+        Layout dictionary with professional styling
+    """
+    # Top-level copy so per-plot tweaks (e.g. barmode) never leak into the cached layout.
+    # The shared sub-dicts hold only strings and numbers, which callers and
+    # _make_json_serializable leave untouched; copy any sub-dict before modifying it
+    return dict(_layout_for(title or "", xaxis_title or "", yaxis_title or ""))
+
+
+# Hover templates shared by all plot types (%{x}/%{y} are filled in by Plotly.js)
+_GROUP_HOVER_TEMPLATE = '<b>{group_col}: {group_val}</b><br>{x_label}: %{{x}}<br>{y_label}: %{{y}}<extra></extra>'
+_HOVER_TEMPLATE = '<b>{x_label}: %{{x}}</b><br>{y_label}: %{{y}}<extra></extra>'
+_GROUP_HOVER_HEAD, _GROUP_HOVER_TAIL = _GROUP_HOVER_TEMPLATE.split('{group_val}')
+
+
+def _group_hover_parts(group_col: str, x_label: str, y_label: str) -> Tuple[str, str]:
+    """
+    Pre-format the constant parts of the grouped hover template for one plot.
+    
+    Each trace's template is then just head + str(group_val) + tail.
+    
+    Args:
+        group_col: Grouping column name
+        x_label: X-axis label
+        y_label: Y-axis label
+        
+    Returns:
+        Tuple of (head, tail) strings surrounding the group value
+    """
+    return (
+        _GROUP_HOVER_HEAD.format(group_col=group_col),
+        _GROUP_HOVER_TAIL.format(x_label=x_label, y_label=y_label)
+    )
+
+# Point count at which scatter plots switch to WebGL ('scattergl') rendering
+_WEBGL_MIN_POINTS = 2000
+
+# Row count above which generate_plot forces a GC pass after releasing the source DataFrame
+_GC_THRESHOLD = 50_000
+
+# Numeric arrays longer than this are emitted as base64 typed-array specs
+_TYPED_ARRAY_MIN_LEN = 100
+
+# numpy dtype name -> Plotly.js typed-array dtype (Plotly.js has no 64-bit integer arrays)
+_TYPED_ARRAY_DTYPES = {
+    "float64": "f8",
+    "float32": "f4",
+    "int32": "i4",
+    "uint32": "u4",
+    "int16": "i2",
+    "uint16": "u2",
+    "int8": "i1",
+    "uint8": "u1",
+}
+
+# Types that are already JSON-serializable as-is
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _to_typed_array(arr: np.ndarray) -> Any:
+    """
+    Encode a numeric array as a Plotly.js typed-array spec ({'dtype', 'bdata'}).
+    
+    Short arrays and non-numeric arrays are returned unchanged. 64-bit integers are
+    narrowed to 32 bits when their range allows it, since Plotly.js cannot decode them.
+    
+    Args:
+        arr: Array to encode
+        
+    Returns:
+        Typed-array spec dictionary, or the original array if it cannot be encoded
+    """
+    if len(arr) <= _TYPED_ARRAY_MIN_LEN:
+        return arr
+    if arr.dtype.kind in "iu" and arr.dtype.itemsize == 8:
+        narrow = np.int32 if arr.dtype.kind == "i" else np.uint32
+        info = np.iinfo(narrow)
+        if arr.min() < info.min or arr.max() > info.max:
+            return arr
+        arr = arr.astype(narrow)
+    dtype = _TYPED_ARRAY_DTYPES.get(arr.dtype.name)
+    if dtype is None:
+        return arr
+    return {
+        "dtype": dtype,
+        "bdata": base64.b64encode(np.ascontiguousarray(arr).tobytes()).decode("ascii")
+    }
+
+
+def _from_typed_array(spec: Dict[str, Any]) -> np.ndarray:
+    """
+    Decode a Plotly.js typed-array spec back into a numpy array.
+    
+    Args:
+        spec: Typed-array spec dictionary with 'dtype' and 'bdata' keys
+        
+    Returns:
+        Decoded numpy array
+    """
+    return np.frombuffer(base64.b64decode(spec["bdata"]), dtype=spec["dtype"])
 
 
 def _make_json_serializable(obj: Any) -> Any:
     """
-    Recursively convert non-JSON-serializable objects (like Sets, frozensets) to JSON-serializable types.
+    Convert non-JSON-serializable objects (like Sets, frozensets, numpy arrays) to JSON-serializable types.
+    
+    Walks the structure with an explicit worklist instead of recursion. Dicts and lists are
+    updated in place and only the leaves that need conversion are replaced, so the input
+    is mutated: pass a copy if the original must stay unchanged.
     
     Args:
-        obj: Object to convert
+        obj: Object to convert (mutated in place)
         
     Returns:
-        JSON-serializable version of the object
+        JSON-serializable version of the object (the same object for dicts and lists)
     """
-    # Handle sets and frozensets (convert to list)
-    if isinstance(obj, (set, frozenset)):
-        return sorted(list(obj)) if obj else []
-    # Handle dictionaries (recursively process values)
-    elif isinstance(obj, dict):
-        return {key: _make_json_serializable(value) for key, value in obj.items()}
-    # Handle lists and tuples (recursively process items)
-    elif isinstance(obj, (list, tuple)):
-        return [_make_json_serializable(item) for item in obj]
-    # Handle basic JSON-serializable types
-    elif isinstance(obj, (str, int, float, bool, type(None))):
-        return obj
-    # Handle numpy arrays first (they have both tolist and item, but item only works for scalars)
-    elif hasattr(obj, 'tolist'):
-        return _make_json_serializable(obj.tolist())
-    # Handle numpy scalar types (0-dimensional arrays)
-    elif hasattr(obj, 'item') and hasattr(obj, 'ndim') and obj.ndim == 0:
-        return obj.item()
-    elif hasattr(obj, 'item'):  # Other types with item() method (but not arrays)
-        try:
-            return obj.item()
-        except (ValueError, AttributeError):
-            # If item() fails, try tolist or convert to string
-            if hasattr(obj, 'tolist'):
-                return _make_json_serializable(obj.tolist())
-            return str(obj)
-    else:
-        # For other types, try to convert to string or use JSON serialization
-        try:
-            # Test if it's already JSON-serializable
-            json.dumps(obj)
-            return obj
-        except (TypeError, ValueError):
-            # If it can't be serialized, convert to string representation
-            return str(obj)
+    # Hold the root in a one-element list so it can be replaced like any other node
+    root = [obj]
+    stack = [(root, 0)]
+    while stack:
+        parent, key = stack.pop()
+        node = parent[key]
+        # Handle basic JSON-serializable types first (the vast majority of leaves)
+        if isinstance(node, _JSON_SCALARS):
+            continue
+        # Handle dictionaries (queue values that still need conversion)
+        elif isinstance(node, dict):
+            stack.extend((node, k) for k, v in node.items() if not isinstance(v, _JSON_SCALARS))
+        # Handle lists (queue items that still need conversion)
+        elif isinstance(node, list):
+            stack.extend((node, i) for i, v in enumerate(node) if not isinstance(v, _JSON_SCALARS))
+        # Handle tuples (convert to list, then revisit)
+        elif isinstance(node, tuple):
+            parent[key] = list(node)
+            stack.append((parent, key))
+        # Handle sets and frozensets (convert to list)
+        elif isinstance(node, (set, frozenset)):
+            parent[key] = sorted(node) if node else []
+        # Handle numpy arrays first (they have both tolist and item, but item only works for scalars)
+        elif hasattr(node, 'tolist'):
+            parent[key] = node.tolist()
+            stack.append((parent, key))
+        # Handle numpy scalar types (0-dimensional arrays)
+        elif hasattr(node, 'item') and hasattr(node, 'ndim') and node.ndim == 0:
+            parent[key] = node.item()
+        elif hasattr(node, 'item'):  # Other types with item() method (but not arrays)
+            try:
+                parent[key] = node.item()
+            except (ValueError, AttributeError):
+                # If item() fails, convert to string
+                parent[key] = str(node)
+        else:
+            # For other types, try to convert to string or use JSON serialization
+            try:
+                # Test if it's already JSON-serializable
+                json.dumps(node)
+            except (TypeError, ValueError):
+                # If it can't be serialized, convert to string representation
+                parent[key] = str(node)
+    return root[0]
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select n_out representative points with Largest-Triangle-Three-Buckets downsampling.
+    
+    The first and last points are always kept. Each bucket in between contributes the point
+    that forms the largest triangle with the previously kept point and the next bucket's mean.
+    
+    Args:
+        x: Sorted numeric x values (float64)
+        y: Numeric y values (float64)
+        n_out: Number of points to keep
+        
+    Returns:
+        Indices of the kept points, in ascending order
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # Bucket boundaries for the n - 2 interior points
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    
+    # Bucket means in one vectorized pass; bucket i + 1 is the lookahead for bucket i
+    # (the last point closes the series as its own bucket)
+    starts = np.append(edges[:-1], n - 1)
+    counts = np.diff(np.append(starts, n))
+    mean_x = np.add.reduceat(x, starts) / counts
+    mean_y = np.add.reduceat(y, starts) / counts
+    
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        avg_x = mean_x[i + 1]
+        avg_y = mean_y[i + 1]
+        # Twice the triangle area for every candidate point in this bucket
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def _build_group_traces(
+    build_trace: Callable[[Tuple[int, pd.DataFrame]], Dict[str, Any]],
+    groups: Iterable[Tuple[int, pd.DataFrame]]
+) -> List[Dict[str, Any]]:
+    """
+    Build one trace per group, in group order.
+    
+    Args:
+        build_trace: Function mapping a (category code, group frame) pair to a trace dict
+        groups: (category code, group frame) pairs, e.g. from a groupby over category codes
+        
+    Returns:
+        List of trace dicts; groups with code -1 (missing group value) are skipped
+    """
+    return [build_trace((i, group_data)) for i, group_data in groups if i >= 0]
+
+
+@dataclass(slots=True)
+class PlotContext:
+    """Column information computed once per plot and shared by the _create_* helpers."""
+    df: pd.DataFrame
+    columns: List[str]
+    col_types: Dict[str, str]
+    numeric_cols: List[str]
+    nominal_cols: List[str]
+    grouping_column: Optional[str] = None
 
 
 class PlotGenerator:
     """Utility class for generating Plotly charts with executive-friendly styling."""
     
+    # Line series longer than this are downsampled to LINE_DOWNSAMPLE_POINTS (numeric x and y only)
+    LINE_DOWNSAMPLE_THRESHOLD = 4000
+    LINE_DOWNSAMPLE_POINTS = 2000
+    
     def __init__(self, plot_planning_agent: Optional[Any] = None):
         """
         Initialize the plot generator.
@@ -200,8 +419,9 @@ class PlotGenerator:
             if columns is None or len(columns) == 0:
                 columns = list(df.columns)
             
-            # Filter to only existing columns
-            columns = [col for col in columns if col in df.columns]
+            # Filter to only existing columns (set lookup instead of scanning the pandas Index)
+            df_cols = set(df.columns)
+            columns = [col for col in columns if col in df_cols]
             
             if len(columns) == 0:
                 logger.warning("No valid columns found for plot")
@@ -228,7 +448,7 @@ class PlotGenerator:
                     # Use columns from config if provided, otherwise use original
                     if plot_config.columns:
                         # Filter to only existing columns
-                        config_columns = [col for col in plot_config.columns if col in df.columns]
+                        config_columns = [col for col in plot_config.columns if col in df_cols]
                         if config_columns:
                             columns = config_columns
                     
@@ -268,24 +488,30 @@ class PlotGenerator:
                 if grouping_hint:
                     grouping_column = self._find_grouping_column(df, columns, grouping_hint, col_types)
             
-            # Generate plot based on type
-            fig = None
+            # Compute column information once for the plot helpers
+            ctx = self._build_plot_context(df, columns, col_types, grouping_column)
+            
+            # Generate plot based on type (each helper returns a {'data', 'layout'} figure dict)
+            fig_dict = None
             if plot_type == "bar":
-                fig = self._create_barplot(df, columns, grouping_column, plot_config, question)
+                fig_dict = self._create_barplot(ctx, plot_config, question)
             elif plot_type == "line":
-                fig = self._create_lineplot(df, columns, grouping_column, plot_config, question)
+                fig_dict = self._create_lineplot(ctx, plot_config, question)
             elif plot_type == "scatter":
-                fig = self._create_scatterplot(df, columns, grouping_column, plot_config, question)
+                fig_dict = self._create_scatterplot(ctx, plot_config, question)
             elif plot_type == "histogram":
-                fig = self._create_histogram(df, columns, grouping_column, plot_config, question)
+                fig_dict = self._create_histogram(ctx, plot_config, question)
             else:
                 logger.warning(f"Unknown plot type: {plot_type}")
                 return None
             
-            if fig:
-                # Convert Plotly figure to dictionary
-                fig_dict = fig.to_dict()
-                # Make it JSON-serializable
+            # Traces no longer reference the source frame, so release it before serialization
+            del df, ctx
+            if len(data) > _GC_THRESHOLD:
+                gc.collect()
+            
+            if fig_dict:
+                # Make it JSON-serializable (pandas Series/numpy arrays -> lists)
                 fig_dict = _make_json_serializable(fig_dict)
                 logger.info(f"Successfully generated {plot_type} plot with {len(fig_dict.get('data', []))} traces")
                 return fig_dict
@@ -303,7 +529,7 @@ class PlotGenerator:
         Extract key metadata from a Plotly figure dictionary.
         
         Args:
-            plot_spec_dict: Plotly figure dictionary (from fig.to_dict())
+            plot_spec_dict: Plotly figure dictionary (as returned by generate_plot())
             plot_type: Original plot type used to generate the plot ('bar', 'line', 'scatter', 'histogram')
                       If provided, this takes precedence over trace type inference
             
@@ -366,11 +592,11 @@ class PlotGenerator:
             else:
                 # Infer from trace type (but note: line plots use Scatter traces)
                 # Map Plotly trace types to our plot types
-                if trace_type == "histogram":
+                if trace_type == "histogram" or (trace_type == "bar" and "bins" in (layout.get("meta") or {})):
                     metadata["plot_type"] = "histogram"
                 elif trace_type == "bar":
                     metadata["plot_type"] = "bar"
-                elif trace_type == "scatter":
+                elif trace_type in ("scatter", "scattergl"):
                     # Distinguish between line plots (lines+markers) and scatter plots (markers only)
                     if "lines" in mode or "line" in mode:
                         metadata["plot_type"] = "line"
@@ -398,10 +624,13 @@ class PlotGenerator:
                         elif metadata["bin_start"] is not None and metadata["bin_end"] is not None:
                             # Try to infer from data range
                             x_data = first_trace.get("x", [])
+                            if isinstance(x_data, dict) and "bdata" in x_data:
+                                x_data = _from_typed_array(x_data).tolist()
                             if x_data:
-                                import numpy as np
                                 if hasattr(x_data, '__iter__') and not isinstance(x_data, str):
-                                    x_array = np.array(list(x_data))
+                                    # Fill the array straight from the iterable (no intermediate list)
+                                    count = len(x_data) if hasattr(x_data, '__len__') else -1
+                                    x_array = np.fromiter(x_data, dtype=np.float64, count=count)
                                     if len(x_array) > 0:
                                         data_min = float(np.min(x_array))
                                         data_max = float(np.max(x_array))
@@ -410,6 +639,15 @@ class PlotGenerator:
                                             metadata["bin_width"] = (data_max - data_min) / nbinsx
                                             metadata["num_bins"] = nbinsx
             
+            # Pre-binned histograms (bar traces) carry their bins in layout.meta
+            layout_meta = layout.get("meta")
+            if isinstance(layout_meta, dict) and isinstance(layout_meta.get("bins"), dict):
+                bins = layout_meta["bins"]
+                metadata["bin_start"] = bins.get("start")
+                metadata["bin_end"] = bins.get("end")
+                metadata["bin_width"] = bins.get("size")
+                metadata["num_bins"] = bins.get("count")
+            
             # Extract grouping information (if multiple traces with names)
             if len(data) > 1:
                 # Check if traces have names (indicating grouping)
@@ -439,19 +677,113 @@ class PlotGenerator:
         Returns:
             Dictionary mapping column names to types ('quantitative' or 'nominal')
         """
+        # Read the dtypes once instead of materializing each column as a Series
+        dtypes = df.dtypes
         types = {}
         for col in columns:
-            if col not in df.columns:
+            if col not in dtypes.index:
                 continue
             
             # Check if column is numeric
-            if pd.api.types.is_numeric_dtype(df[col]):
+            if pd.api.types.is_numeric_dtype(dtypes[col]):
                 types[col] = "quantitative"
             else:
                 types[col] = "nominal"
         
         return types
     
+    def _downsample_line(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Downsample a sorted line series with LTTB when it is too dense to be useful.
+        
+        Series at or below LINE_DOWNSAMPLE_THRESHOLD points, and series with a non-numeric
+        (e.g. categorical) x or y, are returned unchanged.
+        
+        Args:
+            x: Sorted x values
+            y: y values
+        
+        Returns:
+            Tuple of (x, y) arrays
+        """
+        if len(x) <= self.LINE_DOWNSAMPLE_THRESHOLD:
+            return x, y
+        if x.dtype.kind not in "iufM" or y.dtype.kind not in "iuf":
+            return x, y
+        # Datetimes are ranked by their integer nanosecond representation
+        x_num = x.view(np.int64) if x.dtype.kind == "M" else x
+        indices = _lttb_indices(
+            np.ascontiguousarray(x_num, dtype=np.float64),
+            np.ascontiguousarray(y, dtype=np.float64),
+            self.LINE_DOWNSAMPLE_POINTS
+        )
+        return x[indices], y[indices]
+    
+    def _histogram_edges(self, values: pd.Series) -> Optional[np.ndarray]:
+        """
+        Compute histogram bin edges for a numeric column with NumPy's 'auto' rule.
+        
+        Args:
+            values: Column to bin
+        
+        Returns:
+            Array of bin edges, or None if the column is not numeric or has no finite values
+        """
+        if values.dtype.kind not in "iuf":
+            return None
+        arr = values.to_numpy(dtype=np.float64)
+        arr = arr[np.isfinite(arr)]
+        if len(arr) == 0:
+            return None
+        return np.histogram_bin_edges(arr, bins="auto")
+    
+    def _prep_group(self, df: pd.DataFrame, group_col: str) -> Tuple[pd.Series, pd.Index]:
+        """
+        Factorize a grouping column once for cardinality checks and group iteration.
+        
+        Args:
+            df: DataFrame
+            group_col: Grouping column name
+        
+        Returns:
+            Tuple of (codes, categories): integer category codes aligned to df's index
+            (-1 for missing values) and the sorted unique group labels
+        """
+        cat = pd.Categorical(df[group_col])
+        return pd.Series(cat.codes, index=df.index), cat.categories
+    
+    def _build_plot_context(
+        self,
+        df: pd.DataFrame,
+        columns: List[str],
+        col_types: Dict[str, str],
+        grouping_column: Optional[str] = None
+    ) -> PlotContext:
+        """
+        Build the shared column context for the plot helpers.
+        
+        Args:
+            df: DataFrame
+            columns: Final list of column names to plot
+            col_types: Column types already inferred by generate_plot (may not cover all columns)
+            grouping_column: Optional column to use for grouping/color encoding
+        
+        Returns:
+            PlotContext with per-column types and the numeric/nominal columns in column order
+        """
+        missing = [col for col in columns if col not in col_types]
+        if missing:
+            col_types.update(self._infer_column_types(df, missing))
+        types = {col: col_types[col] for col in columns}
+        return PlotContext(
+            df=df,
+            columns=columns,
+            col_types=types,
+            numeric_cols=[col for col in columns if types[col] == "quantitative"],
+            nominal_cols=[col for col in columns if types[col] == "nominal"],
+            grouping_column=grouping_column
+        )
+    
     def _infer_label_from_question(self, column_name: str, question: str, axis: str = "y") -> str:
         """
         Infer a human-readable label from the question and column name.
@@ -535,12 +867,9 @@ class PlotGenerator:
             col_types = self._infer_column_types(df, all_cols)
         else:
             # Ensure we have types for all columns in the dataframe
-            for col in all_cols:
-                if col not in col_types:
-                    if pd.api.types.is_numeric_dtype(df[col]):
-                        col_types[col] = "quantitative"
-                    else:
-                        col_types[col] = "nominal"
+            missing = [col for col in all_cols if col not in col_types]
+            if missing:
+                col_types.update(self._infer_column_types(df, missing))
         
         # Search all categorical columns in the dataframe, not just those in columns list
         categorical_cols = [col for col in all_cols if col_types.get(col) == "nominal"]
@@ -551,51 +880,46 @@ class PlotGenerator:
         # If we have a grouping hint, try to match it to a column
         if grouping_hint:
             hint_lower = grouping_hint.lower()
-            # Try exact match first (case-insensitive)
+            # Lowercase each column name once; the first column wins on case-insensitive collisions
+            cat_by_lower: Dict[str, str] = {}
             for cat_col in categorical_cols:
-                if cat_col.lower() == hint_lower:
-                    return cat_col
+                cat_by_lower.setdefault(cat_col.lower(), cat_col)
+            
+            # Try exact match first (case-insensitive)
+            if hint_lower in cat_by_lower:
+                return cat_by_lower[hint_lower]
             
             # Try partial match (hint in column name or column name in hint)
-            for cat_col in categorical_cols:
-                if hint_lower in cat_col.lower() or cat_col.lower() in hint_lower:
+            for col_lower, cat_col in cat_by_lower.items():
+                if hint_lower in col_lower or col_lower in hint_lower:
                     return cat_col
         
         # If no hint or no match, use first categorical column
         return categorical_cols[0]
     
-    def _create_barplot(self, df: pd.DataFrame, columns: List[str], grouping_column: Optional[str] = None, plot_config: Optional[PlotConfig] = None, question: str = "") -> Optional[go.Figure]:
+    def _create_barplot(self, ctx: PlotContext, plot_config: Optional[PlotConfig] = None, question: str = "") -> Optional[Dict[str, Any]]:
         """Create a bar plot with optional color encoding."""
         try:
-            col_types = self._infer_column_types(df, columns)
+            df = ctx.df
+            if df.empty:
+                logger.info("Empty DataFrame, skipping bar plot")
+                return None
             
             # Use plot_config if available, otherwise infer
             if plot_config and plot_config.x_column:
                 x_col = plot_config.x_column
             else:
-                # Find categorical column for x-axis
-                x_col = None
-                for col in columns:
-                    if col_types.get(col) == "nominal":
-                        x_col = col
-                        break
-                
-                # If no categorical, use first column
-                if x_col is None:
-                    x_col = columns[0]
+                # Use first categorical column for x-axis, or first column if none
+                x_col = ctx.nominal_cols[0] if ctx.nominal_cols else ctx.columns[0]
             
             if plot_config and plot_config.y_column:
                 y_col = plot_config.y_column
             else:
                 # Find quantitative column for y-axis
-                y_col = None
-                for col in columns:
-                    if col != x_col and col_types.get(col) == "quantitative":
-                        y_col = col
-                        break
+                y_col = next((col for col in ctx.numeric_cols if col != x_col), None)
             
-            # Use grouping_column from parameter (set by generate_plot)
-            group_col = grouping_column
+            # Use grouping_column from context (set by generate_plot)
+            group_col = ctx.grouping_column
             
             # Determine labels: use plot_config labels if available, otherwise infer from question
             x_label = None
@@ -633,53 +957,59 @@ class PlotGenerator:
             if not plot_title:
                 plot_title = f"{y_label} by {x_label}"
             
-            # Create figure
-            if group_col and group_col != x_col and y_values[group_col].nunique() <= 10:
-                # Use color grouping
-                fig = go.Figure()
-                unique_groups = sorted(y_values[group_col].unique())
-                for i, group_val in enumerate(unique_groups):
-                    group_data = y_values[y_values[group_col] == group_val]
-                    fig.add_trace(go.Bar(
-                        x=group_data[x_col],
-                        y=group_data[y_col_name],
-                        name=str(group_val),
-                        marker_color=EXECUTIVE_COLORS[i % len(EXECUTIVE_COLORS)],
-                        hovertemplate=f'<b>{group_col}: {group_val}</b><br>{x_label}: %{{x}}<br>{y_label}: %{{y}}<extra></extra>'
-                    ))
-                layout = _get_executive_layout(
-                    title=plot_title,
-                    xaxis_title=x_label,
-                    yaxis_title=y_label
-                )
-                fig.update_layout(**layout)
+            layout = _get_executive_layout(
+                title=plot_title,
+                xaxis_title=x_label,
+                yaxis_title=y_label
+            )
+            
+            # Factorize the grouping column once: cardinality, sorted labels and integer group keys
+            unique_groups = None
+            if group_col and group_col != x_col:
+                group_codes, unique_groups = self._prep_group(y_values, group_col)
+            
+            # Build traces as plain dicts (skips Plotly's per-property validation)
+            if unique_groups is not None and len(unique_groups) <= 10:
+                # Use color grouping (one groupby pass over the category codes)
+                hover_head, hover_tail = _group_hover_parts(group_col, x_label, y_label)
+                
+                def build_trace(item: Tuple[int, pd.DataFrame]) -> Dict[str, Any]:
+                    i, group_data = item
+                    group_val = unique_groups[i]
+                    return {
+                        "type": "bar",
+                        "x": _to_typed_array(group_data[x_col].to_numpy()),
+                        "y": _to_typed_array(group_data[y_col_name].to_numpy()),
+                        "name": str(group_val),
+                        "marker": _COLOR_MARKERS[i % len(_COLOR_MARKERS)],
+                        "hovertemplate": f"{hover_head}{group_val}{hover_tail}"
+                    }
+                
+                traces = _build_group_traces(build_trace, y_values.groupby(group_codes, sort=True))
             else:
                 # Simple bar chart
-                fig = go.Figure(data=[
-                    go.Bar(
-                        x=y_values[x_col],
-                        y=y_values[y_col_name],
-                        marker_color=EXECUTIVE_COLORS[0],
-                        hovertemplate=f'<b>{x_label}: %{{x}}</b><br>{y_label}: %{{y}}<extra></extra>'
-                    )
-                ])
-                layout = _get_executive_layout(
-                    title=plot_title,
-                    xaxis_title=x_label,
-                    yaxis_title=y_label
-                )
-                fig.update_layout(**layout)
+                traces = [{
+                    "type": "bar",
+                    "x": _to_typed_array(y_values[x_col].to_numpy()),
+                    "y": _to_typed_array(y_values[y_col_name].to_numpy()),
+                    "marker": _COLOR_MARKERS[0],
+                    "hovertemplate": _HOVER_TEMPLATE.format(x_label=x_label, y_label=y_label)
+                }]
             
-            return fig
+            return {"data": traces, "layout": layout}
             
         except Exception as e:
             logger.error(f"Error creating bar plot: {e}", exc_info=True)
             return None
     
-    def _create_lineplot(self, df: pd.DataFrame, columns: List[str], grouping_column: Optional[str] = None, plot_config: Optional[PlotConfig] = None, question: str = "") -> Optional[go.Figure]:
+    def _create_lineplot(self, ctx: PlotContext, plot_config: Optional[PlotConfig] = None, question: str = "") -> Optional[Dict[str, Any]]:
         """Create a line plot with optional color encoding for multiple series."""
         try:
-            col_types = self._infer_column_types(df, columns)
+            df = ctx.df
+            if df.empty:
+                logger.info("Empty DataFrame, skipping line plot")
+                return None
+            columns = ctx.columns
             
             # Use plot_config if available, otherwise infer
             if plot_config and plot_config.x_column:
@@ -691,11 +1021,7 @@ class PlotGenerator:
                 y_col = plot_config.y_column
             else:
                 # Find quantitative column for y-axis
-                y_col = None
-                for col in columns:
-                    if col_types.get(col) == "quantitative":
-                        y_col = col
-                        break
+                y_col = ctx.numeric_cols[0] if ctx.numeric_cols else None
             
             # If not from config, find x-axis (prefer ordinal/numeric, but can use any)
             if x_col is None:
@@ -731,60 +1057,72 @@ class PlotGenerator:
             if not plot_title:
                 plot_title = f"{y_label} over {x_label}"
             
-            # Use grouping_column from parameter (set by generate_plot)
-            group_col = grouping_column
-            
-            # Create figure
-            fig = go.Figure()
-            
-            if group_col and df[group_col].nunique() <= 10:
-                # Multiple lines by group
-                unique_groups = sorted(df[group_col].unique())
-                for i, group_val in enumerate(unique_groups):
-                    group_data = df[df[group_col] == group_val].sort_values(x_col)
-                    fig.add_trace(go.Scatter(
-                        x=group_data[x_col],
-                        y=group_data[y_col],
-                        mode='lines+markers',
-                        name=str(group_val),
-                        line=dict(color=EXECUTIVE_COLORS[i % len(EXECUTIVE_COLORS)], width=2.5),
-                        marker=dict(size=6),
-                        hovertemplate=f'<b>{group_col}: {group_val}</b><br>{x_label}: %{{x}}<br>{y_label}: %{{y}}<extra></extra>'
-                    ))
-                layout = _get_executive_layout(
-                    title=plot_title,
-                    xaxis_title=x_label,
-                    yaxis_title=y_label
-                )
-                fig.update_layout(**layout)
+            # Use grouping_column from context (set by generate_plot)
+            group_col = ctx.grouping_column
+            
+            layout = _get_executive_layout(
+                title=plot_title,
+                xaxis_title=x_label,
+                yaxis_title=y_label
+            )
+            
+            # Factorize the grouping column once: cardinality, sorted labels and integer group keys
+            unique_groups = None
+            if group_col:
+                group_codes, unique_groups = self._prep_group(df, group_col)
+            
+            # Build traces as plain dicts (skips Plotly's per-property validation)
+            traces = []
+            if unique_groups is not None and len(unique_groups) <= 10:
+                # Multiple lines by group: one stable sort by (group, x) so every group slice
+                # is already ordered by x, then one groupby pass over the category codes
+                df_sorted = df.sort_values([group_col, x_col], kind="mergesort")
+                hover_head, hover_tail = _group_hover_parts(group_col, x_label, y_label)
+                
+                def build_trace(item: Tuple[int, pd.DataFrame]) -> Dict[str, Any]:
+                    i, group_data = item
+                    group_val = unique_groups[i]
+                    x_vals, y_vals = self._downsample_line(group_data[x_col].to_numpy(), group_data[y_col].to_numpy())
+                    return {
+                        "type": "scatter",
+                        "x": _to_typed_array(x_vals),
+                        "y": _to_typed_array(y_vals),
+                        "mode": "lines+markers",
+                        "name": str(group_val),
+                        "line": _LINE_STYLES[i % len(_LINE_STYLES)],
+                        "marker": _LINE_MARKER,
+                        "hovertemplate": f"{hover_head}{group_val}{hover_tail}"
+                    }
+                
+                traces = _build_group_traces(build_trace, df_sorted.groupby(group_codes, sort=False))
             else:
                 # Single line
                 sorted_df = df.sort_values(x_col)
-                fig.add_trace(go.Scatter(
-                    x=sorted_df[x_col],
-                    y=sorted_df[y_col],
-                    mode='lines+markers',
-                    line=dict(color=EXECUTIVE_COLORS[0], width=2.5),
-                    marker=dict(size=6),
-                    hovertemplate=f'<b>{x_label}: %{{x}}</b><br>{y_label}: %{{y}}<extra></extra>'
-                ))
-                layout = _get_executive_layout(
-                    title=plot_title,
-                    xaxis_title=x_label,
-                    yaxis_title=y_label
-                )
-                fig.update_layout(**layout)
-            
-            return fig
+                x_vals, y_vals = self._downsample_line(sorted_df[x_col].to_numpy(), sorted_df[y_col].to_numpy())
+                traces.append({
+                    "type": "scatter",
+                    "x": _to_typed_array(x_vals),
+                    "y": _to_typed_array(y_vals),
+                    "mode": "lines+markers",
+                    "line": _LINE_STYLES[0],
+                    "marker": _LINE_MARKER,
+                    "hovertemplate": _HOVER_TEMPLATE.format(x_label=x_label, y_label=y_label)
+                })
+            
+            return {"data": traces, "layout": layout}
             
         except Exception as e:
             logger.error(f"Error creating line plot: {e}", exc_info=True)
             return None
     
-    def _create_scatterplot(self, df: pd.DataFrame, columns: List[str], grouping_column: Optional[str] = None, plot_config: Optional[PlotConfig] = None, question: str = "") -> Optional[go.Figure]:
+    def _create_scatterplot(self, ctx: PlotContext, plot_config: Optional[PlotConfig] = None, question: str = "") -> Optional[Dict[str, Any]]:
         """Create a scatter plot with optional color encoding."""
         try:
-            col_types = self._infer_column_types(df, columns)
+            df = ctx.df
+            if df.empty:
+                logger.info("Empty DataFrame, skipping scatter plot")
+                return None
+            columns = ctx.columns
             
             # Use plot_config if available, otherwise infer
             if plot_config and plot_config.x_column:
@@ -796,7 +1134,7 @@ class PlotGenerator:
                 y_col = plot_config.y_column
             else:
                 # For scatter plots, need two quantitative columns
-                quantitative_cols = [col for col in columns if col_types.get(col) == "quantitative"]
+                quantitative_cols = ctx.numeric_cols
                 
                 if len(quantitative_cols) < 2:
                     # If not enough quantitative columns, use first two columns
@@ -810,8 +1148,8 @@ class PlotGenerator:
                     x_col = quantitative_cols[0]
                     y_col = quantitative_cols[1]
             
-            # Use grouping_column from parameter (set by generate_plot)
-            group_col = grouping_column
+            # Use grouping_column from context (set by generate_plot)
+            group_col = ctx.grouping_column
             
             # Determine labels: use plot_config labels if available, otherwise infer from question
             x_label = None
@@ -831,69 +1169,72 @@ class PlotGenerator:
             if not plot_title:
                 plot_title = f"{y_label} vs {x_label}"
             
-            # Create figure
-            fig = go.Figure()
-            
-            if group_col and df[group_col].nunique() <= 10:
-                # Multiple scatter traces by group
-                unique_groups = sorted(df[group_col].unique())
-                for i, group_val in enumerate(unique_groups):
-                    group_data = df[df[group_col] == group_val]
-                    fig.add_trace(go.Scatter(
-                        x=group_data[x_col],
-                        y=group_data[y_col],
-                        mode='markers',
-                        name=str(group_val),
-                        marker=dict(
-                            color=EXECUTIVE_COLORS[i % len(EXECUTIVE_COLORS)],
-                            size=8,
-                            opacity=0.7
-                        ),
-                        hovertemplate=f'<b>{group_col}: {group_val}</b><br>{x_label}: %{{x}}<br>{y_label}: %{{y}}<extra></extra>'
-                    ))
-                layout = _get_executive_layout(
-                    title=plot_title,
-                    xaxis_title=x_label,
-                    yaxis_title=y_label
-                )
-                fig.update_layout(**layout)
+            layout = _get_executive_layout(
+                title=plot_title,
+                xaxis_title=x_label,
+                yaxis_title=y_label
+            )
+            
+            # Factorize the grouping column once: cardinality, sorted labels and integer group keys
+            unique_groups = None
+            if group_col:
+                group_codes, unique_groups = self._prep_group(df, group_col)
+            
+            # Large point clouds render far faster with WebGL than as SVG nodes
+            trace_type = "scattergl" if len(df) >= _WEBGL_MIN_POINTS else "scatter"
+            
+            # Build traces as plain dicts (skips Plotly's per-property validation)
+            traces = []
+            if unique_groups is not None and len(unique_groups) <= 10:
+                # Multiple scatter traces by group (one groupby pass over the category codes)
+                hover_head, hover_tail = _group_hover_parts(group_col, x_label, y_label)
+                
+                def build_trace(item: Tuple[int, pd.DataFrame]) -> Dict[str, Any]:
+                    i, group_data = item
+                    group_val = unique_groups[i]
+                    return {
+                        "type": trace_type,
+                        "x": _to_typed_array(group_data[x_col].to_numpy()),
+                        "y": _to_typed_array(group_data[y_col].to_numpy()),
+                        "mode": "markers",
+                        "name": str(group_val),
+                        "marker": _SCATTER_MARKERS[i % len(_SCATTER_MARKERS)],
+                        "hovertemplate": f"{hover_head}{group_val}{hover_tail}"
+                    }
+                
+                traces = _build_group_traces(build_trace, df.groupby(group_codes, sort=True))
             else:
                 # Single scatter trace
-                fig.add_trace(go.Scatter(
-                    x=df[x_col],
-                    y=df[y_col],
-                    mode='markers',
-                    marker=dict(
-                        color=EXECUTIVE_COLORS[0],
-                        size=8,
-                        opacity=0.7
-                    ),
-                    hovertemplate=f'<b>{x_label}: %{{x}}</b><br>{y_label}: %{{y}}<extra></extra>'
-                ))
-                layout = _get_executive_layout(
-                    title=plot_title,
-                    xaxis_title=x_label,
-                    yaxis_title=y_label
-                )
-                fig.update_layout(**layout)
-            
-            return fig
+                traces.append({
+                    "type": trace_type,
+                    "x": _to_typed_array(df[x_col].to_numpy()),
+                    "y": _to_typed_array(df[y_col].to_numpy()),
+                    "mode": "markers",
+                    "marker": _SCATTER_MARKERS[0],
+                    "hovertemplate": _HOVER_TEMPLATE.format(x_label=x_label, y_label=y_label)
+                })
+            
+            return {"data": traces, "layout": layout}
             
         except Exception as e:
             logger.error(f"Error creating scatter plot: {e}", exc_info=True)
             return None
     
-    def _create_histogram(self, df: pd.DataFrame, columns: List[str], grouping_column: Optional[str] = None, plot_config: Optional[PlotConfig] = None, question: str = "") -> Optional[go.Figure]:
+    def _create_histogram(self, ctx: PlotContext, plot_config: Optional[PlotConfig] = None, question: str = "") -> Optional[Dict[str, Any]]:
         """Create a histogram with support for grouping by categorical columns."""
         try:
-            col_types = self._infer_column_types(df, columns)
+            df = ctx.df
+            if df.empty:
+                logger.info("Empty DataFrame, skipping histogram")
+                return None
+            columns = ctx.columns
             
             # Use plot_config if available, otherwise infer
             if plot_config and plot_config.x_column:
                 col = plot_config.x_column
             else:
                 # For histograms, need one quantitative column
-                quantitative_cols = [col for col in columns if col_types.get(col) == "quantitative"]
+                quantitative_cols = ctx.numeric_cols
                 
                 if len(quantitative_cols) == 0:
                     # If no quantitative column, use first column
@@ -905,8 +1246,8 @@ class PlotGenerator:
                 else:
                     col = quantitative_cols[0]
             
-            # Use grouping_column from parameter (set by generate_plot)
-            group_col = grouping_column
+            # Use grouping_column from context (set by generate_plot)
+            group_col = ctx.grouping_column
             
             # Verify grouping column exists in dataframe
             if group_col and group_col not in df.columns:
@@ -930,42 +1271,68 @@ class PlotGenerator:
             if not plot_title:
                 plot_title = f"Distribution of {x_label}"
             
-            # Create figure
-            fig = go.Figure()
-            
-            if group_col and df[group_col].nunique() <= 5:
-                # Overlaid histograms by group
-                unique_groups = sorted(df[group_col].unique())
-                for i, group_val in enumerate(unique_groups):
-                    group_data = df[df[group_col] == group_val]
-                    fig.add_trace(go.Histogram(
-                        x=group_data[col],
-                        name=str(group_val),
-                        opacity=0.7,
-                        marker_color=EXECUTIVE_COLORS[i % len(EXECUTIVE_COLORS)],
-                        hovertemplate=f'<b>{group_col}: {group_val}</b><br>{x_label}: %{{x}}<br>{y_label}: %{{y}}<extra></extra>'
-                    ))
-                layout = _get_executive_layout(
-                    title=plot_title,
-                    xaxis_title=x_label,
-                    yaxis_title=y_label
-                )
-                fig.update_layout(**layout, barmode='overlay')
+            layout = _get_executive_layout(
+                title=plot_title,
+                xaxis_title=x_label,
+                yaxis_title=y_label
+            )
+            
+            # Factorize the grouping column once: cardinality, sorted labels and integer group keys
+            unique_groups = None
+            if group_col:
+                group_codes, unique_groups = self._prep_group(df, group_col)
+            
+            # Bin numeric columns here so only bin counts are shipped (one shared set of edges keeps
+            # group overlays aligned); other columns are left to Plotly.js to count
+            edges = self._histogram_edges(df[col])
+            if edges is not None:
+                centers = _to_typed_array((edges[:-1] + edges[1:]) / 2)
+                bin_width = float(edges[1] - edges[0])
+                layout["bargap"] = 0
+                layout["meta"] = {
+                    "bins": {
+                        "start": float(edges[0]),
+                        "end": float(edges[-1]),
+                        "size": bin_width,
+                        "count": len(edges) - 1
+                    }
+                }
+            
+            def binned_or_raw(values: np.ndarray) -> Dict[str, Any]:
+                """Trace type and data: a bar per bin when pre-binned, raw values otherwise."""
+                if edges is None:
+                    return {"type": "histogram", "x": _to_typed_array(values)}
+                counts, _ = np.histogram(values[~np.isnan(values)], bins=edges)
+                return {"type": "bar", "x": centers, "y": _to_typed_array(counts), "width": bin_width}
+            
+            # Build traces as plain dicts (skips Plotly's per-property validation)
+            traces = []
+            if unique_groups is not None and len(unique_groups) <= 5:
+                # Overlaid histograms by group (one groupby pass over the category codes)
+                hover_head, hover_tail = _group_hover_parts(group_col, x_label, y_label)
+                
+                def build_trace(item: Tuple[int, pd.DataFrame]) -> Dict[str, Any]:
+                    i, group_data = item
+                    group_val = unique_groups[i]
+                    return {
+                        **binned_or_raw(group_data[col].to_numpy()),
+                        "name": str(group_val),
+                        "opacity": 0.7,
+                        "marker": _COLOR_MARKERS[i % len(_COLOR_MARKERS)],
+                        "hovertemplate": f"{hover_head}{group_val}{hover_tail}"
+                    }
+                
+                traces = _build_group_traces(build_trace, df.groupby(group_codes, sort=True))
+                layout["barmode"] = "overlay"
             else:
                 # Simple histogram
-                fig.add_trace(go.Histogram(
-                    x=df[col],
-                    marker_color=EXECUTIVE_COLORS[0],
-                    hovertemplate=f'<b>{x_label}: %{{x}}</b><br>{y_label}: %{{y}}<extra></extra>'
-                ))
-                layout = _get_executive_layout(
-                    title=plot_title,
-                    xaxis_title=x_label,
-                    yaxis_title=y_label
-                )
-                fig.update_layout(**layout)
-            
-            return fig
+                traces.append({
+                    **binned_or_raw(df[col].to_numpy()),
+                    "marker": _COLOR_MARKERS[0],
+                    "hovertemplate": _HOVER_TEMPLATE.format(x_label=x_label, y_label=y_label)
+                })
+            
+            return {"data": traces, "layout": layout}
             
         except Exception as e:
             logger.error(f"Error creating histogram: {e}", exc_info=True)
@@ -1,7 +1,87 @@
 """Response formatting utilities for agent outputs."""
-from typing import Literal, Optional, Dict, Any
+import io
+import itertools
+import json
+from typing import Literal, Optional, Dict, Any, List
 from app.core.models import QueryAgentOutput, ExecutionPlan
 
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib encoder
+    orjson = None
+
+# Column type tags for the common exact value types in query results
+_TYPE_TAGS = {
+    int: "numeric",
+    float: "numeric",
+    bool: "numeric",
+    str: "text",
+    type(None): "unknown",
+}
+
+
+def _type_tag(val: Any) -> str:
+    """
+    Get the column type tag ('numeric', 'text' or 'unknown') for a sample value.
+    
+    Args:
+        val: Sample value from a result row
+        
+    Returns:
+        Type tag string
+    """
+    tag = _TYPE_TAGS.get(type(val))
+    if tag is None:
+        # Subclasses (e.g. numpy floats) still count as numeric
+        tag = "numeric" if isinstance(val, (int, float)) else "text"
+    return tag
+
+
+def _infer_column_tags(data: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Infer a type tag for every column of a query result.
+    
+    Tags come from the first row; columns that are None there take the tag of their
+    first non-null value further down, so a leading NULL does not hide the column type.
+    
+    Args:
+        data: Query result rows (non-empty)
+        
+    Returns:
+        Dictionary mapping column name to type tag, in first-row column order
+    """
+    tags = {col: _type_tag(val) for col, val in data[0].items()}
+    pending = [col for col, tag in tags.items() if tag == "unknown"]
+    for row in data[1:]:
+        if not pending:
+            break
+        still_pending = []
+        for col in pending:
+            val = row.get(col)
+            if val is None:
+                still_pending.append(col)
+            else:
+                tags[col] = _type_tag(val)
+        pending = still_pending
+    return tags
+
+
+def _write_json(data: Any, buf: io.StringIO) -> None:
+    """
+    Serialize data as 2-space indented JSON into buf.
+    
+    Uses orjson when it is installed, otherwise the stdlib json module.
+    Values that are not natively serializable (dates, Decimals, ...) are written via str().
+    
+    Args:
+        data: JSON-like data to serialize
+        buf: Buffer to write into
+    """
+    if orjson is not None:
+        buf.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode())
+    else:
+        json.dump(data, buf, indent=2, default=str)
+
 
 class ResponseFormatter:
     """Formats agent outputs for synthesizer input."""
@@ -32,69 +112,60 @@ class ResponseFormatter:
                 raise ValueError("agent_output must be provided for database_query intent")
             
             query_output: QueryAgentOutput = agent_output
-            context = (
-                f"User question: {user_message}\n\n"
-            )
+            # Write everything into one buffer; the JSON payload is streamed straight into it
+            buf = io.StringIO()
+            buf.write(f"User question: {user_message}\n\n")
             
             # Indicate if cached data was used
             if execution_plan and execution_plan.use_cached_data:
-                context += "Note: Using cached data from a previous query (no new database query executed).\n"
+                buf.write("Note: Using cached data from a previous query (no new database query executed).\n")
             
             # Indicate if a plot will be generated
             if execution_plan and execution_plan.requires_plot:
                 plot_type_name = execution_plan.plot_type or "visualization"
-                context += f"Note: A {plot_type_name} plot will be generated to visualize the results.\n"
+                buf.write(f"Note: A {plot_type_name} plot will be generated to visualize the results.\n")
             
-            context += (
+            buf.write(
                 f"SQL Query executed: {query_output.sql_query}\n"
                 f"Query explanation: {query_output.explanation}\n"
                 f"Query success: {query_output.query_result.success}\n"
             )
             
             if query_output.query_result.success:
-                if query_output.query_result.row_count == 0:
-                    context += "Query returned 0 rows."
+                if query_output.query_result.row_count == 0 or not query_output.query_result.data:
+                    buf.write("Query returned 0 rows.")
                 else:
                     # Include column information and actual data values
-                    if query_output.query_result.data:
-                        columns = list(query_output.query_result.data[0].keys())
-                        # Infer data types
-                        sample_row = query_output.query_result.data[0]
-                        col_info = []
-                        for col in columns:
-                            val = sample_row.get(col)
-                            if val is not None:
-                                if isinstance(val, (int, float)):
-                                    col_info.append(f"{col} (numeric)")
-                                else:
-                                    col_info.append(f"{col} (text)")
-                            else:
-                                col_info.append(f"{col} (unknown)")
-                        
-                        row_count = query_output.query_result.row_count
-                        context += f"Query returned {row_count} row(s) with columns: {', '.join(col_info)}\n"
-                        context += f"IMPORTANT: When presenting data in a table, show maximum 10 rows. If there are more than 10 rows, show only the first 10 and include a note: 'Note: Showing first 10 rows of {row_count} total rows.'\n\n"
-                        
-                        # Optimize data size: for large result sets, include only sample rows
-                        MAX_ROWS_TO_INCLUDE = 50
-                        SAMPLE_SIZE = 10
-                        
-                        if row_count > MAX_ROWS_TO_INCLUDE:
-                            # Include only first SAMPLE_SIZE rows for large result sets
-                            sample_data = query_output.query_result.data[:SAMPLE_SIZE]
-                            import json
-                            context += f"Query result data (showing first {SAMPLE_SIZE} of {row_count} rows):\n"
-                            context += json.dumps(sample_data, indent=2)
-                            context += f"\n\nNote: Full dataset ({row_count} rows) is available for plot generation if needed."
-                            context += f"\n\nIMPORTANT: Use the actual numeric values from the query result data above to calculate specific changes, percentages, differences, and other quantitative metrics in your analysis. The data contains all the values you need for precise calculations."
-                        else:
-                            # Include all data for smaller result sets
-                            context += "Query result data:\n"
-                            import json
-                            context += json.dumps(query_output.query_result.data, indent=2)
-                            context += "\n\nIMPORTANT: Use the actual numeric values from the query result data above to calculate specific changes, percentages, differences, and other quantitative metrics in your analysis. The data contains all the values you need for precise calculations."
+                    # (data types are inferred per column, looking past leading NULLs)
+                    col_info = [
+                        f"{col} ({tag})"
+                        for col, tag in _infer_column_tags(query_output.query_result.data).items()
+                    ]
+                    
+                    row_count = query_output.query_result.row_count
+                    buf.write(f"Query returned {row_count} row(s) with columns: {', '.join(col_info)}\n")
+                    buf.write(f"IMPORTANT: When presenting data in a table, show maximum 10 rows. If there are more than 10 rows, show only the first 10 and include a note: 'Note: Showing first 10 rows of {row_count} total rows.'\n\n")
+                    
+                    # Optimize data size: for large result sets, include only sample rows
+                    MAX_ROWS_TO_INCLUDE = 50
+                    SAMPLE_SIZE = 10
+                    
+                    if row_count > MAX_ROWS_TO_INCLUDE:
+                        # Include only first SAMPLE_SIZE rows for large result sets
+                        sample_data = list(itertools.islice(query_output.query_result.data, SAMPLE_SIZE))
+                        buf.write(f"Query result data (showing first {SAMPLE_SIZE} of {row_count} rows):\n")
+                        _write_json(sample_data, buf)
+                        buf.write(f"\n\nNote: Full dataset ({row_count} rows) is available for plot generation if needed.")
+                        buf.write(f"\n\nIMPORTANT: Use the actual numeric values from the query result data above to calculate specific changes, percentages, differences, and other quantitative metrics in your analysis. The data contains all the values you need for precise calculations.")
+                    else:
+                        # Include all data for smaller result sets
+                        buf.write("Query result data:\n")
+                        _write_json(query_output.query_result.data, buf)
+                        buf.write("\n\nIMPORTANT: Use the actual numeric values from the query result data above to calculate specific changes, percentages, differences, and other quantitative metrics in your analysis. The data contains all the values you need for precise calculations.")
             else:
-                context += f"Query error: {query_output.query_result.error}"
+                buf.write(f"Query error: {query_output.query_result.error}")
+            
+            context = buf.getvalue()
         else:
             # For general questions, pass the user question directly to synthesizer
             context = f"User question: {user_message}"
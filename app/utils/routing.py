@@ -1,18 +1,106 @@
 """Routing utilities for intent-based agent routing."""
+import asyncio
+import hashlib
+import os
+import random
+import time
+from collections import OrderedDict
 from typing import Optional, List, Tuple, Any
-from pydantic_ai import ModelMessage
+from pydantic_ai import ModelMessage, ModelRequest, UserPromptPart
+from pydantic_ai.messages import ModelMessagesTypeAdapter
 import mlflow
 import logging
 
 from app.core.models import QueryAgentOutput
 from app.agents.database_query_agent import DatabaseQueryAgent
+from app.utils.tracing import TraceManager
 
 logger = logging.getLogger(__name__)
 
+# Follow-up turn sent after a failed attempt
+_ERROR_CONTEXT_TEMPLATE = (
+    "IMPORTANT: The previous query failed with error: {error_msg}\n"
+    "Failed query: {failed_query}\n"
+    "Please analyze the error, use schema tools if needed to find the correct column/table names, "
+    "generate a corrected query, and execute it using the query_database tool."
+)
+
+# Error fragments for transient failures (contention, timeouts, rate limits) that a
+# corrected query cannot fix but that may clear up after a short wait
+_TRANSIENT_ERROR_MARKERS = (
+    "database is locked",
+    "database table is locked",
+    "busy",
+    "timeout",
+    "timed out",
+    "rate limit",
+    "too many requests",
+    "429",
+    "temporarily unavailable",
+)
+
+# Error fragments for failures no corrected query can fix (I/O, permissions, auth)
+_UNRECOVERABLE_ERROR_MARKERS = (
+    "unable to open database",
+    "readonly database",
+    "disk i/o error",
+    "database disk image is malformed",
+    "permission denied",
+    "access denied",
+    "not authorized",
+    "authentication",
+    "unauthorized",
+)
+
+
+class RetryBucket:
+    """Token bucket limiting the aggregate retry rate across all requests in the process."""
+    
+    def __init__(self, capacity: int = 10, refill_per_sec: float = 1.0):
+        """
+        Initialize a full bucket.
+        
+        Args:
+            capacity: Maximum number of retries that can be spent in a burst
+            refill_per_sec: Tokens added back per second
+        """
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+    
+    def try_acquire(self) -> bool:
+        """
+        Take one retry token if available.
+        
+        Returns:
+            True if the retry may proceed, False if the retry budget is exhausted
+        """
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_sec)
+        self._updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+# Shared by every Router: initial attempts are never limited, retries are
+_RETRY_BUCKET = RetryBucket(capacity=10, refill_per_sec=1.0)
+
 
 class Router:
     """Handles intent-based routing to appropriate agents."""
     
+    # Successful attempts remembered for identical (message, history) inputs
+    EXACT_CACHE_SIZE = 128
+    EXACT_CACHE_TTL = 300.0  # Seconds before a cached result is re-queried
+    
+    # Exponential backoff (seconds) before retrying after a transient failure
+    BACKOFF_BASE = 1.0
+    BACKOFF_MAX = 30.0
+    BACKOFF_JITTER = 0.5  # Delay is scaled by a random factor in [1 - jitter, 1 + jitter]
+    
     def __init__(self, database_query_agent: DatabaseQueryAgent):
         """
         Initialize the router.
@@ -21,6 +109,8 @@ class Router:
             database_query_agent: Database query agent instance
         """
         self.database_query_agent = database_query_agent
+        # {hash of (message, history): (stored at, data version, QueryAgentOutput)}, least recently used first
+        self._exact_cache: "OrderedDict[str, Tuple[float, Any, QueryAgentOutput]]" = OrderedDict()
         self.max_retries = 2  # Maximum retries (3 total attempts: initial + 2 retries)
     
     def _build_error_context(self, error_msg: str, failed_query: str) -> str:
@@ -32,14 +122,95 @@ class Router:
             failed_query: The SQL query that failed
             
         Returns:
-            Error context string to append to user message
+            Error context string, sent as its own user turn after the original message
         """
-        return (
-            f"\n\nIMPORTANT: The previous query failed with error: {error_msg}\n"
-            f"Failed query: {failed_query}\n"
-            f"Please analyze the error, use schema tools if needed to find the correct column/table names, "
-            f"generate a corrected query, and execute it using the query_database tool."
-        )
+        return _ERROR_CONTEXT_TEMPLATE.format(error_msg=error_msg, failed_query=failed_query)
+    
+    def _is_recoverable_error(self, error_msg: str) -> bool:
+        """
+        Check whether a retry could fix a query error.
+        
+        SQL errors (unknown column/table, syntax) and transient failures are recoverable;
+        I/O, permission and authentication failures are not.
+        
+        Args:
+            error_msg: The error message from the failed query
+            
+        Returns:
+            False if the error matches a known unrecoverable failure
+        """
+        error_lower = error_msg.lower()
+        return not any(marker in error_lower for marker in _UNRECOVERABLE_ERROR_MARKERS)
+    
+    def _is_transient_error(self, error_msg: str) -> bool:
+        """
+        Check whether a query error looks transient (worth waiting before the retry).
+        
+        Args:
+            error_msg: The error message from the failed query
+            
+        Returns:
+            True for contention, timeout and rate-limit errors
+        """
+        error_lower = error_msg.lower()
+        return any(marker in error_lower for marker in _TRANSIENT_ERROR_MARKERS)
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Compute the jittered exponential backoff delay after a failed attempt.
+        
+        Args:
+            attempt: Zero-based index of the attempt that failed
+            
+        Returns:
+            Delay in seconds
+        """
+        delay = min(self.BACKOFF_BASE * 2 ** attempt, self.BACKOFF_MAX)
+        return delay * random.uniform(1 - self.BACKOFF_JITTER, 1 + self.BACKOFF_JITTER)
+    
+    def _exact_cache_key(
+        self,
+        user_message: str,
+        message_history: Optional[List[ModelMessage]] = None
+    ) -> str:
+        """
+        Hash an attempt's inputs for the exact-match cache.
+        
+        Args:
+            user_message: The user's message (including any error context)
+            message_history: Optional message history for context
+            
+        Returns:
+            Hex digest identifying the (message, history) pair
+        """
+        digest = hashlib.blake2b(user_message.encode(), digest_size=16)
+        if message_history:
+            digest.update(b"||")
+            digest.update(ModelMessagesTypeAdapter.dump_json(message_history))
+        return digest.hexdigest()
+    
+    def _data_version(self) -> Any:
+        """
+        Identify the current state of the queried database for the exact-match cache.
+        
+        Returns:
+            Modification times of the database file and its WAL file (None when unavailable),
+            which change when the data is reloaded (e.g. by db/generate_data.py)
+        """
+        db_path = getattr(getattr(self.database_query_agent, "db_tool", None), "db_path", None)
+        if db_path is None:
+            return None
+        version = []
+        for path in (str(db_path), f"{db_path}-wal"):
+            try:
+                version.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                version.append(None)
+        return tuple(version)
+    
+    def clear_cache(self) -> None:
+        """Drop all exact-match cached query results (e.g. on reset or after a data reload)."""
+        self._exact_cache.clear()
     
     async def _execute_query_attempt(
         self,
@@ -54,12 +225,33 @@ class Router:
             message_history: Optional message history for context
             
         Returns:
-            Tuple of (QueryAgentOutput, RunResult) from the agent execution
+            Tuple of (QueryAgentOutput, RunResult) from the agent execution; the RunResult is
+            None when the output is answered from the exact-match cache
         """
+        # Identical message and history on unchanged data: reuse the earlier successful output
+        # without an LLM call
+        cache_key = self._exact_cache_key(user_message, message_history)
+        data_version = self._data_version()
+        cached = self._exact_cache.get(cache_key)
+        if cached is not None:
+            stored_at, cached_version, cached_output = cached
+            if time.monotonic() - stored_at <= self.EXACT_CACHE_TTL and cached_version == data_version:
+                self._exact_cache.move_to_end(cache_key)
+                logger.info("Database query answered from exact-match cache")
+                return cached_output, None
+            del self._exact_cache[cache_key]
+        
         run_result = await self.database_query_agent.run(
             user_message,
             message_history=message_history
         )
+        
+        # Only successful outputs are cached (not the RunResult and its message list);
+        # failures should be retried against the model
+        if run_result.output.query_result.success:
+            self._exact_cache[cache_key] = (time.monotonic(), data_version, run_result.output)
+            while len(self._exact_cache) > self.EXACT_CACHE_SIZE:
+                self._exact_cache.popitem(last=False)
         return run_result.output, run_result
     
     @mlflow.trace(name="route_to_database_query")
@@ -77,7 +269,8 @@ class Router:
             message_history: Optional message history for context
             
         Returns:
-            Tuple of (QueryAgentOutput, RunResult) with SQL query and results
+            Tuple of (QueryAgentOutput, RunResult) with SQL query and results (RunResult is
+            None when answered from the exact-match cache)
         """
         original_message = user_message
         current_message_history = message_history
@@ -110,18 +303,43 @@ class Router:
                 error_msg = agent_output.query_result.error or "Unknown error"
                 failed_query = agent_output.sql_query
                 
+                # Don't spend more LLM calls on errors a corrected query cannot fix
+                if not self._is_recoverable_error(error_msg):
+                    logger.error(
+                        f"Database query failed on attempt {attempt + 1} with unrecoverable error: "
+                        f"{error_msg}. Not retrying."
+                    )
+                    TraceManager.tag_retry_terminated("unrecoverable")
+                    break
+                
+                # Under sustained failures, drop retries instead of piling more load on the backend
+                if not _RETRY_BUCKET.try_acquire():
+                    logger.warning(
+                        f"Database query failed on attempt {attempt + 1}: {error_msg}. "
+                        f"Retry budget exhausted, not retrying."
+                    )
+                    TraceManager.tag_retry_terminated("retry_budget")
+                    break
+                
                 logger.warning(
                     f"Database query failed on attempt {attempt + 1}: {error_msg}. "
                     f"Retrying... ({self.max_retries - attempt} retries remaining)"
                 )
                 
-                # Build error context and update message for retry
-                error_context = self._build_error_context(error_msg, failed_query)
-                user_message = original_message + error_context
+                # Retry with the error context as a new user turn. The history plus the original
+                # question stay a byte-identical prefix across retries, so provider prompt caches still hit
+                if current_message_history is message_history:
+                    current_message_history = list(message_history or []) + [
+                        ModelRequest(parts=[UserPromptPart(content=original_message)])
+                    ]
+                user_message = self._build_error_context(error_msg, failed_query)
                 
-                # Initialize message history if needed
-                if current_message_history is None:
-                    current_message_history = []
+                # Back off before retrying transient failures; SQL errors are retried right away
+                # since the retry is a corrected query, not a repeat of the same one
+                if self._is_transient_error(error_msg):
+                    delay = self._backoff_delay(attempt)
+                    logger.info(f"Transient database error, backing off {delay:.2f}s before retrying")
+                    await asyncio.sleep(delay)
             else:
                 # All retries exhausted
                 logger.error(
@@ -1,19 +1,133 @@
 """Session state management for orchestrator."""
-from typing import Dict, Any, Optional, List
-from pydantic_ai import ModelMessage
+import asyncio
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Tuple, Union
+from pydantic_ai import ModelMessage, ModelRequest, SystemPromptPart, UserPromptPart
+from pydantic_ai.messages import ModelMessagesTypeAdapter
 import logging
 from app.core.models import QueryAgentOutput
 
+if TYPE_CHECKING:
+    from app.db.manager import DatabaseManager
+
 logger = logging.getLogger(__name__)
 
+# Cached query results serializing larger than this (bytes) are held zlib-compressed
+COMPRESS_THRESHOLD = 4096
+# Fast compression level: tabular JSON compresses well even at level 1
+COMPRESS_LEVEL = 1
+
+
+def _pack_result(result: QueryAgentOutput) -> Union[QueryAgentOutput, bytes]:
+    """
+    Compress a query result for the session cache if it is large.
+    
+    Args:
+        result: Query result to cache
+        
+    Returns:
+        The result itself, or its compressed JSON if it exceeds COMPRESS_THRESHOLD
+    """
+    payload = result.model_dump_json().encode()
+    if len(payload) <= COMPRESS_THRESHOLD:
+        return result
+    return zlib.compress(payload, COMPRESS_LEVEL)
+
+
+def _serialize_result(value: Union[QueryAgentOutput, bytes]) -> Tuple[bytes, bool]:
+    """
+    Get the stored form of a cached query result (compressed results are stored as-is).
+    
+    Args:
+        value: Entry from cached_query_results
+        
+    Returns:
+        Tuple of (payload, compressed): zlib-compressed JSON, or plain JSON for small results
+    """
+    if isinstance(value, bytes):
+        return value, True
+    return value.model_dump_json().encode(), False
+
+
+def _snapshot(session_state: Dict[str, Any]) -> Tuple:
+    """
+    Capture what a session's persisted state depends on, to detect changes since a save.
+    
+    Holds references to the history list, its last message and the cached values, so their
+    identities stay unique while the snapshot is kept (replacing or appending to any of them
+    marks the session as changed).
+    
+    Args:
+        session_state: Session state dictionary
+        
+    Returns:
+        Snapshot tuple for _same_snapshot()
+    """
+    history = session_state["message_history"]
+    return (
+        history,
+        len(history),
+        history[-1] if history else None,
+        session_state.get("latest_key"),
+        tuple(session_state.get("cached_query_results", {}).items())
+    )
+
+
+def _same_snapshot(a: Tuple, b: Tuple) -> bool:
+    """Check whether two snapshots from _snapshot() describe unchanged session state."""
+    return (
+        a[0] is b[0]
+        and a[1] == b[1]
+        and a[2] is b[2]
+        and a[3] == b[3]
+        and len(a[4]) == len(b[4])
+        and all(key_a == key_b and value_a is value_b for (key_a, value_a), (key_b, value_b) in zip(a[4], b[4]))
+    )
+
+
+def _unpack_result(value: Union[QueryAgentOutput, bytes]) -> QueryAgentOutput:
+    """
+    Get a cached query result, decompressing it if needed.
+    
+    Args:
+        value: Entry from cached_query_results
+        
+    Returns:
+        QueryAgentOutput
+    """
+    if isinstance(value, bytes):
+        return QueryAgentOutput.model_validate_json(zlib.decompress(value))
+    return value
+
 
 class SessionManager:
     """Manages session state for the orchestrator."""
     
-    def __init__(self):
-        """Initialize session manager with empty state storage."""
+    # Bounds on resident session state
+    MAX_SESSIONS = 1000  # Least recently used sessions are evicted beyond this
+    MAX_HISTORY_MESSAGES = 40  # Hard cap per session (summarization normally keeps it well below)
+    MAX_CACHED_RESULTS = 5  # Cached query results kept per session
+    
+    def __init__(self, db_manager: Optional["DatabaseManager"] = None):
+        """
+        Initialize session manager with empty state storage.
+        
+        Args:
+            db_manager: Optional app database for persisting session state. Without it,
+                sessions live only in memory and are lost on eviction or restart.
+        """
         # Session state storage: {session_id: {"message_history": [...], "cached_query_results": {...}}}
-        self._session_state: Dict[str, Dict[str, Any]] = {}
+        # Ordered by recency of access (least recently used first)
+        self._session_state: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.db_manager = db_manager
+        # Snapshot of each resident session as last loaded or saved, so unchanged sessions are not rewritten
+        self._saved_snapshots: Dict[str, Tuple] = {}
+        # Single database thread: reads and writes stay off the event loop and run in submission order
+        self._db_executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-db") if db_manager is not None else None
+        )
     
     def get_or_create_session(
         self, 
@@ -31,19 +145,218 @@ class SessionManager:
             Session state dictionary
         """
         if session_id not in self._session_state:
-            # New session - initialize with message history from database
-            self._session_state[session_id] = {
-                "message_history": message_history or [],
-                "cached_query_results": {}  # Dict[str, QueryAgentOutput] - keyed by query identifier
-            }
+            # Not resident - restore persisted state, or start a new session with the database history
+            session_state = self._load_session(session_id)
+            if session_state is None:
+                self._install_session(session_id, self._new_session_state(message_history))
+            else:
+                self._install_session(session_id, session_state, persisted=True)
+                if not session_state["message_history"] and message_history:
+                    session_state["message_history"] = message_history
         else:
+            self._session_state.move_to_end(session_id)
             # Existing session - merge database history with session state
             # Session state takes precedence (has most recent messages)
             # Only use database history if session state is empty
             if not self._session_state[session_id]["message_history"] and message_history:
                 self._session_state[session_id]["message_history"] = message_history
         
-        return self._session_state[session_id]
+        session_state = self._session_state[session_id]
+        session_state["message_history"] = self._trim_history(session_state["message_history"])
+        return session_state
+    
+    def _new_session_state(self, message_history: Optional[List[ModelMessage]] = None) -> Dict[str, Any]:
+        """
+        Build the state of a session that has nothing persisted.
+        
+        Args:
+            message_history: Optional message history from database
+            
+        Returns:
+            Session state dictionary
+        """
+        return {
+            "message_history": message_history or [],
+            "cached_query_results": OrderedDict(),  # Dict[str, QueryAgentOutput | compressed bytes] - keyed by query identifier, oldest first
+            "latest_key": None  # Key of the most recently stored query result
+        }
+    
+    def _install_session(self, session_id: str, session_state: Dict[str, Any], persisted: bool = False) -> None:
+        """
+        Make a session resident, evicting the least recently used sessions beyond MAX_SESSIONS.
+        
+        Args:
+            session_id: Session identifier
+            session_state: Session state dictionary
+            persisted: Whether the state was just loaded from the database (and so needs no save)
+        """
+        self._session_state[session_id] = session_state
+        if persisted:
+            self._saved_snapshots[session_id] = _snapshot(session_state)
+        while len(self._session_state) > self.MAX_SESSIONS:
+            evicted_id, _ = self._session_state.popitem(last=False)
+            self._saved_snapshots.pop(evicted_id, None)
+            logger.debug(f"Evicted least recently used session {evicted_id}")
+    
+    def _read_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read and decode a session's persisted state (runs on the database thread).
+        
+        Compressed query results are kept compressed; only small ones are decoded here.
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            Session state dictionary, or None if not persisted (or unreadable)
+        """
+        try:
+            row = self.db_manager.get_orchestrator_session(session_id)
+            if row is None:
+                return None
+            return {
+                "message_history": ModelMessagesTypeAdapter.validate_json(row["message_history"] or "[]"),
+                "cached_query_results": OrderedDict(
+                    (key, payload if compressed else QueryAgentOutput.model_validate_json(payload))
+                    for key, payload, compressed in row["cached_query_results"]
+                ),
+                "latest_key": row["latest_key"]
+            }
+        except Exception as e:
+            logger.warning(f"Failed to load persisted state for session {session_id}: {e}")
+            return None
+    
+    def _load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Restore a session's state from the database, waiting for the database thread.
+        
+        Async callers should call load_session() first, so this finds the session resident.
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            Session state dictionary, or None if not persisted (or unreadable)
+        """
+        if self._db_executor is None:
+            return None
+        return self._db_executor.submit(self._read_session, session_id).result()
+    
+    async def load_session(self, session_id: str) -> None:
+        """
+        Make a session resident without blocking the event loop.
+        
+        Restores the persisted state, or installs a new empty session when nothing is
+        persisted, so a following get_or_create_session() never reads the database.
+        No-op if the session is already resident or there is no database.
+        
+        Args:
+            session_id: Session identifier
+        """
+        if self._db_executor is None or session_id in self._session_state:
+            return
+        loop = asyncio.get_running_loop()
+        session_state = await loop.run_in_executor(self._db_executor, self._read_session, session_id)
+        if session_id in self._session_state:
+            return
+        if session_state is None:
+            self._install_session(session_id, self._new_session_state())
+        else:
+            self._install_session(session_id, session_state, persisted=True)
+    
+    def schedule_save(self, session_id: str) -> Optional[Future]:
+        """
+        Queue a write of a resident session's state, without waiting for it.
+        
+        Sessions unchanged since they were last loaded or saved are skipped. The state is
+        serialized right away (compressed query results as they are); the database write
+        runs on the database thread, after any earlier writes.
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            Future of the write, or None if nothing was written
+        """
+        session_state = self._session_state.get(session_id)
+        if self._db_executor is None or session_state is None:
+            return None
+        snapshot = _snapshot(session_state)
+        saved = self._saved_snapshots.get(session_id)
+        if saved is not None and _same_snapshot(saved, snapshot):
+            return None
+        try:
+            message_history = ModelMessagesTypeAdapter.dump_json(session_state["message_history"]).decode()
+            cached_results = [(key, *_serialize_result(value)) for key, value in snapshot[4]]
+        except Exception as e:
+            logger.warning(f"Failed to serialize state for session {session_id}: {e}")
+            return None
+        self._saved_snapshots[session_id] = snapshot
+        return self._db_executor.submit(
+            self._write_session, session_id, message_history, cached_results, snapshot[3]
+        )
+    
+    def _write_session(
+        self,
+        session_id: str,
+        message_history: str,
+        cached_results: List[Tuple[str, bytes, bool]],
+        latest_key: Optional[str]
+    ) -> None:
+        """
+        Write serialized session state to the database (runs on the database thread).
+        
+        Args:
+            session_id: Session identifier
+            message_history: Serialized message history (JSON)
+            cached_results: (key, payload, compressed) per cached query result, oldest first
+            latest_key: Key of the most recently stored query result
+        """
+        try:
+            self.db_manager.save_orchestrator_session(session_id, message_history, cached_results, latest_key)
+        except Exception as e:
+            logger.warning(f"Failed to persist state for session {session_id}: {e}")
+            # Retry on the next save
+            self._saved_snapshots.pop(session_id, None)
+    
+    def save_session(self, session_id: str) -> None:
+        """
+        Persist a resident session's state and wait for the write (no-op without a database).
+        
+        Args:
+            session_id: Session identifier
+        """
+        future = self.schedule_save(session_id)
+        if future is not None:
+            future.result()
+    
+    def _trim_history(self, history: List[ModelMessage]) -> List[ModelMessage]:
+        """
+        Keep at most MAX_HISTORY_MESSAGES messages, preserving a leading system message.
+        
+        The kept recent messages always start at a user turn (a ModelRequest with a user
+        prompt), so the trimmed history never opens with a model response or a tool return
+        separated from its tool call, which providers reject.
+        
+        Args:
+            history: Message history
+            
+        Returns:
+            The history itself if within bounds, otherwise a trimmed copy
+        """
+        if len(history) <= self.MAX_HISTORY_MESSAGES:
+            return history
+        first = history[0]
+        # Keep the system message (e.g. the conversation summary) ahead of the recent messages
+        head = [first] if isinstance(first, ModelRequest) and any(
+            isinstance(part, SystemPromptPart) for part in first.parts
+        ) else []
+        # Move the cut forward to the first user turn within the budget
+        for start in range(len(history) - self.MAX_HISTORY_MESSAGES + len(head), len(history)):
+            message = history[start]
+            if isinstance(message, ModelRequest) and any(isinstance(part, UserPromptPart) for part in message.parts):
+                return head + history[start:]
+        return head
     
     def get_session_state(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -66,10 +379,29 @@ class SessionManager:
         """
         if session_id in self._session_state:
             del self._session_state[session_id]
+        self._saved_snapshots.pop(session_id, None)
+        if self._db_executor is not None:
+            # Queued behind any pending save of the session, so it cannot be resurrected
+            self._db_executor.submit(self._delete_session, session_id)
     
     def reset_all_sessions(self) -> None:
         """Reset all sessions."""
         self._session_state.clear()
+        self._saved_snapshots.clear()
+        if self._db_executor is not None:
+            self._db_executor.submit(self._delete_session)
+    
+    def _delete_session(self, session_id: Optional[str] = None) -> None:
+        """
+        Delete persisted session state (runs on the database thread).
+        
+        Args:
+            session_id: Session identifier. If None, deletes all sessions.
+        """
+        try:
+            self.db_manager.delete_orchestrator_session(session_id)
+        except Exception as e:
+            logger.warning(f"Failed to delete persisted state for session {session_id or 'all'}: {e}")
     
     def store_query_result(self, session_id: str, key: str, result: QueryAgentOutput) -> None:
         """
@@ -82,9 +414,14 @@ class SessionManager:
         """
         session_state = self.get_or_create_session(session_id)
         if "cached_query_results" not in session_state:
-            session_state["cached_query_results"] = {}
-        session_state["cached_query_results"][key] = result
+            session_state["cached_query_results"] = OrderedDict()
+        cached_results = session_state["cached_query_results"]
+        # Re-storing a key makes it the most recent entry
+        cached_results.pop(key, None)
+        cached_results[key] = _pack_result(result)
+        session_state["latest_key"] = key
         logger.debug(f"Stored query result with key '{key}' for session {session_id}")
+        self.clear_old_results(session_id, keep_last_n=self.MAX_CACHED_RESULTS)
     
     def get_query_result(self, session_id: str, key: str) -> Optional[QueryAgentOutput]:
         """
@@ -92,7 +429,7 @@ class SessionManager:
         
         Args:
             session_id: Session identifier
-            key: Key identifying the query result
+            key: Key identifying the query result ('latest' resolves to the most recent result)
         
         Returns:
             QueryAgentOutput if found, None otherwise
@@ -102,7 +439,10 @@ class SessionManager:
             return None
         
         cached_results = session_state.get("cached_query_results", {})
-        return cached_results.get(key)
+        value = cached_results.get(key)
+        if value is None and key == "latest":
+            return self.get_latest_query_result(session_id)
+        return _unpack_result(value) if value is not None else None
     
     def get_latest_query_result(self, session_id: str) -> Optional[QueryAgentOutput]:
         """
@@ -122,15 +462,17 @@ class SessionManager:
         if not cached_results:
             return None
         
-        # Try 'latest' key first, otherwise get the last item
-        if "latest" in cached_results:
-            return cached_results["latest"]
+        # The tracked most recent key, then a 'latest' entry (from sessions persisted before
+        # results were stored only once)
+        latest_key = session_state.get("latest_key")
+        if latest_key in cached_results:
+            return _unpack_result(cached_results[latest_key])
         
-        # Return the last item in the dict (Python 3.7+ maintains insertion order)
-        if cached_results:
-            return list(cached_results.values())[-1]
+        if "latest" in cached_results:
+            return _unpack_result(cached_results["latest"])
         
-        return None
+        # Fall back to the last item in the dict (insertion order) without copying the values
+        return _unpack_result(next(reversed(cached_results.values())))
     
     def clear_old_results(self, session_id: str, keep_last_n: int = 5) -> None:
         """
@@ -148,23 +490,17 @@ class SessionManager:
         if len(cached_results) <= keep_last_n:
             return
         
-        # Keep 'latest' if it exists, then keep the most recent N-1 others
-        latest = cached_results.pop("latest", None)
-        
-        # Convert to list of (key, value) tuples, sort by some criteria (we'll use insertion order)
-        items = list(cached_results.items())
-        
-        # Keep only the last N-1 items (or N if no 'latest')
-        keep_count = keep_last_n - (1 if latest else 0)
-        items_to_keep = items[-keep_count:] if len(items) > keep_count else items
-        
-        # Rebuild the dict
-        new_results = {}
-        if latest:
-            new_results["latest"] = latest
-        for key, value in items_to_keep:
-            new_results[key] = value
+        # Drop the oldest entries in place, always keeping 'latest' (N-1 others when it exists)
+        removed = 0
+        while len(cached_results) > keep_last_n:
+            oldest_key = next(iter(cached_results))
+            if oldest_key == "latest":
+                # 'latest' is normally the newest entry; skip past it when it is not
+                oldest_key = next((key for key in cached_results if key != "latest"), None)
+                if oldest_key is None:
+                    break
+            del cached_results[oldest_key]
+            removed += 1
         
-        session_state["cached_query_results"] = new_results
-        logger.debug(f"Cleared old results for session {session_id}, kept {len(new_results)} results")
+        logger.debug(f"Cleared {removed} old results for session {session_id}, kept {len(cached_results)} results")
 
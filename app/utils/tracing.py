@@ -1,4 +1,5 @@
 """MLflow tracing utilities for consistent trace tagging."""
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Optional, Dict, Any
 import mlflow
@@ -6,9 +7,55 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Tags accumulated for the current trace, written in one update by TraceManager.flush_tags()
+_pending_tags: ContextVar[Optional[Dict[str, Any]]] = ContextVar("pending_trace_tags", default=None)
+
+
+def _trace_active() -> bool:
+    """Check whether there is an active MLflow trace to tag (False when tracing is disabled)."""
+    try:
+        return mlflow.get_current_active_span() is not None
+    except Exception:
+        return False
+
 
 class TraceManager:
-    """Manages MLflow trace tagging and metadata."""
+    """
+    Manages MLflow trace tagging and metadata.
+    
+    Tags are buffered per context and written with a single update_current_trace()
+    call when flush_tags() runs at the end of the traced request.
+    """
+    
+    @staticmethod
+    def add_tags(**tags: Any) -> None:
+        """
+        Queue tags for the current trace.
+        
+        Args:
+            **tags: Tags to add (later values override earlier ones)
+        """
+        if not _trace_active():
+            return
+        pending = _pending_tags.get()
+        if pending is None:
+            pending = {}
+            _pending_tags.set(pending)
+        pending.update(tags)
+    
+    @staticmethod
+    def flush_tags() -> None:
+        """Write all queued tags to the current trace in one update and reset the buffer."""
+        pending = _pending_tags.get()
+        if not pending:
+            return
+        _pending_tags.set(None)
+        if not _trace_active():
+            return
+        try:
+            mlflow.update_current_trace(tags=pending)
+        except Exception as e:
+            logger.debug(f"Failed to tag MLflow trace: {e}")
     
     @staticmethod
     def tag_trace(
@@ -26,6 +73,9 @@ class TraceManager:
             intent_type: Optional intent type
             **additional_tags: Additional tags to add
         """
+        # Nothing to tag: skip building the tag dict and timestamp
+        if not _trace_active():
+            return
         try:
             tags: Dict[str, Any] = {
                 "mlflow.trace.session": session_id,
@@ -41,7 +91,7 @@ class TraceManager:
             # Add any additional tags
             tags.update(additional_tags)
             
-            mlflow.update_current_trace(tags=tags)
+            TraceManager.add_tags(**tags)
         except Exception as e:
             logger.debug(f"Failed to tag MLflow trace: {e}")
     
@@ -53,8 +103,15 @@ class TraceManager:
         Args:
             intent_type: Intent type to tag
         """
-        try:
-            mlflow.update_current_trace(tags={"intent_type": intent_type})
-        except Exception as e:
-            logger.debug(f"Failed to tag MLflow trace with intent_type: {e}")
+        TraceManager.add_tags(intent_type=intent_type)
+    
+    @staticmethod
+    def tag_retry_terminated(reason: str) -> None:
+        """
+        Tag trace with the reason a retry loop stopped early.
+        
+        Args:
+            reason: Why retries were stopped (e.g. 'unrecoverable')
+        """
+        TraceManager.add_tags(retry_terminated=reason)
 
@@ -1,15 +1,8 @@
 """Loader for Iris dataset."""
-import sys
-from pathlib import Path
 from sklearn.datasets import load_iris
 import pandas as pd
 
-# Add project root to path for imports
-project_root = Path(__file__).parent.parent.parent
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
-
-from db.database_manager import DatabaseManager  # noqa: E402
+from db.database_manager import DatabaseManager
 
 
 def load_iris_data(db_manager: DatabaseManager) -> None:
@@ -36,40 +29,34 @@ def load_iris_data(db_manager: DatabaseManager) -> None:
         print("Iris table already exists. Skipping creation.")
         return
     
-    # Create table
-    print("Creating iris table...")
-    db_manager.create_table(
-        "iris",
-        """
-        (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            sepal_length REAL,
-            sepal_width REAL,
-            petal_length REAL,
-            petal_width REAL,
-            species TEXT
+    # Create and fill the table in one transaction: a single commit, and a failed load
+    # leaves no empty table behind (which would otherwise be skipped on the next run)
+    with db_manager.transaction():
+        # Create table
+        print("Creating iris table...")
+        db_manager.create_table(
+            "iris",
+            """
+            (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sepal_length REAL,
+                sepal_width REAL,
+                petal_length REAL,
+                petal_width REAL,
+                species TEXT
+            )
+            """
         )
-        """
-    )
-    
-    # Insert data
-    print("Inserting Iris data...")
-    conn, cursor = db_manager.get_cursor()
-    
-    for _, row in df.iterrows():
-        cursor.execute("""
-            INSERT INTO iris (sepal_length, sepal_width, petal_length, petal_width, species)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            row['sepal length (cm)'],
-            row['sepal width (cm)'],
-            row['petal length (cm)'],
-            row['petal width (cm)'],
-            row['species']
-        ))
-    
-    conn.commit()
-    conn.close()
+        
+        # Insert data column-wise with multi-row INSERT statements instead of a statement per row
+        print("Inserting Iris data...")
+        db_manager.insert_dataframe("iris", df, columns={
+            'sepal length (cm)': 'sepal_length',
+            'sepal width (cm)': 'sepal_width',
+            'petal length (cm)': 'petal_length',
+            'petal width (cm)': 'petal_width',
+            'species': 'species'
+        })
     
     print(f"Iris data loaded successfully. Total records: {len(df)}")
     print("\nSample data:")
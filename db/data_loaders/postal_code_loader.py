@@ -1,16 +1,38 @@
 """Loader for postal code data from PxWeb API."""
 import json
-import sys
+from functools import lru_cache
 import requests  # type: ignore
 import numpy as np  # type: ignore
 from pathlib import Path
 
-# Add project root to path for imports
-project_root = Path(__file__).parent.parent.parent
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
+from db.database_manager import DatabaseManager
 
-from db.database_manager import DatabaseManager  # noqa: E402
+try:
+    import orjson  # type: ignore
+except ImportError:  # Optional: fall back to the stdlib decoder
+    orjson = None
+
+# Chunk size (bytes) for streaming the API response body
+RESPONSE_CHUNK_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=32)
+def _load_query_json(path_str: str, mtime: float) -> dict:
+    """
+    Load and parse a PxWeb query file (cached; the mtime in the key invalidates edited files).
+    
+    Args:
+        path_str: Path to the JSON query file
+        mtime: Modification time of the file, part of the cache key
+        
+    Returns:
+        The query object (unwrapped from queryObj when present)
+    """
+    with open(path_str, "r", encoding="utf-8") as f:
+        query_json = json.load(f)
+    
+    # Handle different JSON structures (some may be wrapped in queryObj)
+    return query_json.get("queryObj", query_json)
 
 
 def load_pxweb_postal_code_dataset(
@@ -46,19 +68,18 @@ def load_pxweb_postal_code_dataset(
     if not query_file.exists():
         raise FileNotFoundError(f"Query file not found: {query_file}")
     
-    with open(query_file, "r", encoding="utf-8") as f:
-        query_json = json.load(f)
-    
-    # Handle different JSON structures (some may be wrapped in queryObj)
-    if "queryObj" in query_json:
-        query_json = query_json["queryObj"]
+    query_json = _load_query_json(str(query_file), query_file.stat().st_mtime)
     
     # Make POST request
     print(f"Fetching {dataset_description} from PxWeb API...")
     try:
-        response = requests.post(api_url, json=query_json, timeout=60)
-        response.raise_for_status()
-        data = response.json()
+        # Stream the body in large chunks and decode the raw bytes once (orjson if available)
+        # instead of building the intermediate text string that response.json() needs
+        with requests.post(api_url, json=query_json, timeout=60, stream=True) as response:
+            response.raise_for_status()
+            body = b"".join(response.iter_content(chunk_size=RESPONSE_CHUNK_SIZE))
+        data = orjson.loads(body) if orjson is not None else json.loads(body)
+        del body
     except requests.exceptions.RequestException as e:
         print(f"Error fetching data from API: {e}")
         raise
@@ -75,43 +96,47 @@ def load_pxweb_postal_code_dataset(
     
     print(f"Found {len(postal_codes)} postal codes and {len(years)} years")
     
-    # Reshape values into matrix (row first: postal_code x year)
-    vals = np.array(data['value']).reshape(len(postal_codes), len(years))
-    
-    # Create long format table
-    print(f"Creating {table_name} table...")
-    
-    long_schema = f"""(
-    postal_code TEXT,
-    postal_area TEXT,
-    year TEXT,
-    {value_column_name} REAL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    PRIMARY KEY (postal_code, year)
-)"""
-    db_manager.create_table(table_name, long_schema)
-    
-    # Insert data in long format
-    print(f"Inserting {dataset_description} (long format)...")
-    conn, cursor = db_manager.get_cursor()
-    
-    for i, postal_code in enumerate(postal_codes):
-        for j, year in enumerate(years):
-            val = vals[i, j]
-            # Handle null/missing values
-            if val is None or (isinstance(val, float) and np.isnan(val)):
-                value = None
-            else:
-                value = float(val)
-            
-            query = f"""
-                INSERT INTO {table_name} (postal_code, postal_area, year, {value_column_name})
-                VALUES (?, ?, ?, ?)
-            """
-            cursor.execute(query, (postal_code, postal_areas[i], year, value))
-    
-    conn.commit()
-    conn.close()
+    # Reshape values into matrix (row first: postal_code x year); nulls become NaN
+    vals = np.array(data['value'], dtype=np.float64).reshape(len(postal_codes), len(years))
+    
+    # Create, fill and index the table in one transaction: a single commit, and a failed
+    # load leaves no empty table behind (which would otherwise be skipped on the next run)
+    with db_manager.transaction():
+        # Create long format table
+        print(f"Creating {table_name} table...")
+        
+        long_schema = f"""(
+        postal_code TEXT,
+        postal_area TEXT,
+        year TEXT,
+        {value_column_name} REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (postal_code, year)
+    )"""
+        db_manager.create_table(table_name, long_schema)
+        
+        # Insert data in long format: build the row columns with NumPy (postal code major,
+        # matching the value matrix) and insert them with multi-row INSERT statements
+        print(f"Inserting {dataset_description} (long format)...")
+        pc_col = np.repeat(postal_codes, len(years)).tolist()
+        pa_col = np.repeat(postal_areas, len(years)).tolist()
+        yr_col = np.tile(years, len(postal_codes)).tolist()
+        # Missing values are stored as NULL
+        val_col = np.where(np.isnan(vals), None, vals).ravel().tolist()
+        
+        db_manager.bulk_insert(
+            table_name,
+            ["postal_code", "postal_area", "year", value_column_name],
+            zip(pc_col, pa_col, yr_col, val_col)
+        )
+        
+        # The primary key serves postal_code lookups; year-only filters need their own index.
+        # Built after the bulk insert (cheaper than maintaining it row by row), then ANALYZE
+        # so the query planner has statistics for the freshly loaded table
+        db_manager.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table_name}_year ON {table_name} (year, postal_code)"
+        )
+        db_manager.execute(f"ANALYZE {table_name}")
     
     total_records = len(postal_codes) * len(years)
     print(f"{dataset_description} loaded successfully. Total records: {total_records}")
@@ -1,36 +1,121 @@
 """General database management for MyDataBase.db."""
+import itertools
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Per-connection tuning: fsync only at WAL checkpoints, temp tables in memory,
+# 64 MB page cache, 256 MB memory-mapped I/O, and up to 30 s of waiting on another
+# connection's write lock (loaders may write concurrently)
+_CONNECTION_PRAGMAS = """
+    PRAGMA busy_timeout=30000;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+    PRAGMA mmap_size=268435456;
+"""
 
 
 class DatabaseManager:
     """Manages database operations for MyDataBase.db with support for multiple data sources."""
     
-    def __init__(self, db_path: Optional[Path] = None):
+    # Rows per executemany() call / multi-row INSERT statement in bulk inserts
+    DEFAULT_BATCH_SIZE = 500
+    
+    def __init__(self, db_path: Optional[Path] = None, batch_size: int = DEFAULT_BATCH_SIZE):
         """
         Initialize the database manager.
         
         Args:
             db_path: Path to SQLite database file. If None, uses default db/MyDataBase.db
+            batch_size: Rows per executemany() call / multi-row INSERT statement in bulk inserts
         """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        self.batch_size = batch_size
+        
         if db_path is None:
             db_folder = Path(__file__).parent
             db_path = db_folder / "MyDataBase.db"
         
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # WAL journaling is persistent in the database file, so it only needs to be set once;
+        # readers no longer block on (or block) writers
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.close()
+        
+        # One reusable connection per thread
+        self._tls = threading.local()
     
     def get_connection(self) -> sqlite3.Connection:
         """
-        Get a database connection.
+        Get this thread's database connection, opening it on first use.
+        
+        The connection is reused by every helper on the same thread, so the file open,
+        PRAGMA setup and page cache warmup happen once. Call close() when done.
         
         Returns:
             SQLite connection object
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = getattr(self._tls, "conn", None)
+        if conn is not None:
+            try:
+                conn.total_changes  # Raises if the connection was closed
+                return conn
+            except sqlite3.ProgrammingError:
+                pass
+        
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.executescript(_CONNECTION_PRAGMAS)
+        self._tls.conn = conn
         return conn
     
+    def close(self) -> None:
+        """Close this thread's connection, if one is open."""
+        conn = getattr(self._tls, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._tls.conn = None
+    
+    def __enter__(self) -> "DatabaseManager":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Group several helper calls into one transaction (one commit, all-or-nothing).
+        
+        The write lock is taken up front (BEGIN IMMEDIATE), so do slow work such as
+        network fetches before entering. Nested use joins the outer transaction.
+        
+        Yields:
+            This thread's connection
+        """
+        conn = self.get_connection()
+        if getattr(self._tls, "in_transaction", False):
+            yield conn
+            return
+        
+        self._tls.in_transaction = True
+        try:
+            # Commit on success, roll back on error; the connection stays open for reuse
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                yield conn
+        finally:
+            self._tls.in_transaction = False
+    
     def table_exists(self, table_name: str) -> bool:
         """
         Check if a table exists in the database.
@@ -47,9 +132,7 @@ class DatabaseManager:
             SELECT name FROM sqlite_master 
             WHERE type='table' AND name=?
         """, (table_name,))
-        result = cursor.fetchone() is not None
-        conn.close()
-        return result
+        return cursor.fetchone() is not None
     
     def create_table(self, table_name: str, schema: str, if_not_exists: bool = True) -> None:
         """
@@ -60,17 +143,14 @@ class DatabaseManager:
             schema: SQL CREATE TABLE statement (without CREATE TABLE part)
             if_not_exists: If True, adds IF NOT EXISTS clause
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         if if_not_exists:
             query = f"CREATE TABLE IF NOT EXISTS {table_name} {schema}"
         else:
             query = f"CREATE TABLE {table_name} {schema}"
         
-        cursor.execute(query)
-        conn.commit()
-        conn.close()
+        # Commits on its own unless called inside transaction()
+        with self.transaction() as conn:
+            conn.execute(query)
     
     def execute(self, query: str, parameters: Optional[Tuple] = None) -> None:
         """
@@ -80,35 +160,80 @@ class DatabaseManager:
             query: SQL query string
             parameters: Optional tuple of parameters for parameterized queries
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        if parameters:
-            cursor.execute(query, parameters)
-        else:
-            cursor.execute(query)
-        
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            if parameters:
+                conn.execute(query, parameters)
+            else:
+                conn.execute(query)
     
-    def executemany(self, query: str, parameters: List[Tuple]) -> None:
+    def executemany(self, query: str, parameters: Iterable[Tuple]) -> None:
         """
         Execute a SQL query multiple times with different parameters.
         
         Args:
             query: SQL query string
-            parameters: List of parameter tuples
+            parameters: Iterable of parameter tuples (consumed lazily, no list needed)
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.executemany(query, parameters)
-        conn.commit()
-        conn.close()
+        rows = iter(parameters)
+        # Feed the rows in batch_size chunks (one transaction, same cached prepared statement)
+        with self.transaction() as conn:
+            while batch := list(itertools.islice(rows, self.batch_size)):
+                conn.executemany(query, batch)
+    
+    def bulk_insert(self, table_name: str, columns: Sequence[str], rows: Iterable[Tuple]) -> None:
+        """
+        Insert rows with multi-row INSERT ... VALUES (...), (...) statements.
+        
+        Each statement carries up to batch_size rows, capped so its parameters stay within
+        SQLite's host parameter limit. This does less per-row work inside SQLite than
+        executemany() with one row per statement.
+        
+        Args:
+            table_name: Table to insert into
+            columns: Column names, in the order of the row tuples
+            rows: Iterable of row tuples (consumed lazily)
+        """
+        width = len(columns)
+        row_sql = "(" + ", ".join("?" * width) + ")"
+        prefix = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES "
+        
+        rows = iter(rows)
+        with self.transaction() as conn:
+            max_params = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+            rows_per_statement = max(1, min(self.batch_size, max_params // width))
+            # Full chunks reuse one cached statement; only the tail needs a shorter one
+            full_sql = prefix + ", ".join([row_sql] * rows_per_statement)
+            while batch := list(itertools.islice(rows, rows_per_statement)):
+                sql = full_sql if len(batch) == rows_per_statement else prefix + ", ".join([row_sql] * len(batch))
+                conn.execute(sql, list(itertools.chain.from_iterable(batch)))
+    
+    def insert_dataframe(
+        self,
+        table_name: str,
+        df: "pd.DataFrame",
+        columns: Optional[Mapping[str, str]] = None
+    ) -> None:
+        """
+        Bulk insert a DataFrame into an existing table.
+        
+        Rows are built from whole-column tolist() conversions (NaN is stored as NULL)
+        rather than per-row itertuples(), then inserted with bulk_insert().
+        
+        Args:
+            table_name: Table to insert into
+            df: DataFrame to insert
+            columns: Optional {DataFrame column: table column} mapping selecting the
+                columns to insert; if None, all columns are inserted under their own names
+        """
+        if columns is None:
+            columns = {name: name for name in df.columns}
+        rows = zip(*(df[name].tolist() for name in columns))
+        self.bulk_insert(table_name, list(columns.values()), rows)
     
     def get_cursor(self) -> sqlite3.Cursor:
         """
         Get a cursor for manual transaction management.
-        Use with context manager or ensure commit/close.
+        Ensure commit; the connection is shared, so close it via close() rather than directly.
         
         Returns:
             Tuple of (connection, cursor)
@@ -4,11 +4,14 @@ Run this script to populate MyDataBase.db with various datasets.
 """
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-# Add project root to path for imports
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# Add project root to path for imports (only when run by file path;
+# imports and `python -m db.generate_data` already have it)
+if not __package__:
+    project_root = Path(__file__).parent.parent
+    sys.path.insert(0, str(project_root))
 
 from db.database_manager import DatabaseManager  # noqa: E402
 from db.data_loaders.iris_loader import load_iris_data  # noqa: E402
@@ -18,6 +21,29 @@ from db.data_loaders.postal_code_loader import (  # noqa: E402
 )
 
 
+# Data sources by CLI flag (argparse dest): (description, loader). The loaders write to
+# independent tables, so any selection can run concurrently
+LOADERS = {
+    "iris": ("Iris data", load_iris_data),
+    "postal_code": ("postal code income data", load_postal_code_data),
+    "postal_code_apartment": ("postal code apartment m2 data", load_postal_code_apartment_m2_data),
+}
+
+
+def _run_loader(loader, db_manager: DatabaseManager) -> None:
+    """
+    Run a loader on a worker thread and release that thread's connection afterwards.
+    
+    Args:
+        loader: Loader function taking the DatabaseManager
+        db_manager: Shared DatabaseManager (connections are per thread)
+    """
+    try:
+        loader(db_manager)
+    finally:
+        db_manager.close()
+
+
 def main():
     """Main function to load data sources into the database."""
     parser = argparse.ArgumentParser(description="Load data sources into MyDataBase.db")
@@ -41,51 +67,46 @@ def main():
         action="store_true",
         help="Load all available data sources"
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DatabaseManager.DEFAULT_BATCH_SIZE,
+        help=f"Rows per batch in bulk inserts (default: {DatabaseManager.DEFAULT_BATCH_SIZE})"
+    )
     
     args = parser.parse_args()
     
-    # If no specific source is selected, load all
-    load_all = args.all or (not args.iris and not args.postal_code and not args.postal_code_apartment)
+    # Resolve --all (or no source flags, which means all) into the per-source flags once,
+    # so each loader is selected by its own flag alone
+    if args.all or not any(getattr(args, key) for key in LOADERS):
+        for key in LOADERS:
+            setattr(args, key, True)
+    selected = [key for key in LOADERS if getattr(args, key)]
     
     # Initialize database manager
-    db_manager = DatabaseManager()
+    db_manager = DatabaseManager(batch_size=args.batch_size)
     print(f"Using database: {db_manager.db_path}")
     print()
     
     errors = []
     
-    # Load Iris data
-    if load_all or args.iris:
-        try:
-            load_iris_data(db_manager)
-            print()
-        except Exception as e:
-            error_msg = f"Error loading Iris data: {e}"
-            print(f"ERROR: {error_msg}")
-            errors.append(error_msg)
-            print()
-    
-    # Load postal code income data
-    if load_all or args.postal_code:
-        try:
-            load_postal_code_data(db_manager)
-            print()
-        except Exception as e:
-            error_msg = f"Error loading postal code income data: {e}"
-            print(f"ERROR: {error_msg}")
-            errors.append(error_msg)
-            print()
-    
-    # Load postal code apartment m2 data
-    if load_all or args.postal_code_apartment:
-        try:
-            load_postal_code_apartment_m2_data(db_manager)
-            print()
-        except Exception as e:
-            error_msg = f"Error loading postal code apartment m2 data: {e}"
-            print(f"ERROR: {error_msg}")
-            errors.append(error_msg)
-            print()
+    # Run the loaders concurrently: each is mostly waiting on HTTP or SQLite, so the total
+    # time is roughly the slowest loader instead of the sum. Each worker thread gets its own
+    # connection from the DatabaseManager; WAL and the busy timeout serialize the writes
+    with ThreadPoolExecutor(max_workers=len(selected)) as executor:
+        futures = {
+            executor.submit(_run_loader, LOADERS[key][1], db_manager): LOADERS[key][0]
+            for key in selected
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+                print()
+            except Exception as e:
+                error_msg = f"Error loading {futures[future]}: {e}"
+                print(f"ERROR: {error_msg}")
+                errors.append(error_msg)
+                print()
     
     # Summary
     if errors:
@@ -0,0 +1,18 @@
+"""Shared MLflow helpers for the prompt management scripts."""
+from functools import lru_cache
+
+from app.core.prompt_registry import PromptRegistry
+
+
+@lru_cache(maxsize=1)
+def get_registry() -> PromptRegistry:
+    """
+    Get the process-wide PromptRegistry.
+    
+    The registry (its MlflowClient and cached prompt listing) is created once and shared
+    by every script or test that imports this helper, instead of per call.
+    
+    Returns:
+        Shared PromptRegistry instance
+    """
+    return PromptRegistry()
@@ -11,12 +11,17 @@ Usage:
 """
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Tuple
 
-# Add parent directory to path to import app modules
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add parent directory to path to import app modules (only when run by file path;
+# imports and `python -m scripts.register_prompts` already have it)
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.core.prompt_registry import PromptRegistry
+from scripts._mlflow_common import get_registry
 import logging
 
 # Set up logging
@@ -27,6 +32,45 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Concurrent MLflow registration requests
+MAX_WORKERS = 8
+
+
+def register_one(registry: PromptRegistry, name: str, template: str, force: bool) -> Tuple[str, str]:
+    """
+    Register a single prompt.
+    
+    Args:
+        registry: PromptRegistry to register with
+        name: Prompt name
+        template: Prompt template text
+        force: If True, create a new version even if the prompt exists
+        
+    Returns:
+        Tuple of (status, output line), status being 'registered', 'skipped' or 'error'
+    """
+    try:
+        # Check if prompt exists (only if not forcing)
+        if not force and registry._prompt_exists(name):
+            return "skipped", f"SKIP:  {name} (already exists)"
+        
+        # Register the prompt
+        registry.register_prompt_if_missing(
+            name=name,
+            template=template,
+            commit_message="Initial version from codebase" if not force else "Updated version from codebase",
+            tags={"source": "codebase", "agent": name},
+            force_update=force
+        )
+        
+        if force:
+            return "registered", f"UPDATE: {name}"
+        return "registered", f"REGISTER: {name}"
+        
+    except Exception as e:
+        return "error", f"ERROR:  {name} - {e}"
+
+
 def main():
     """Main function to register prompts."""
     parser = argparse.ArgumentParser(
@@ -49,7 +93,7 @@ def main():
     
     # Initialize prompt registry
     try:
-        registry = PromptRegistry()
+        registry = get_registry()
         if registry._client is None:
             print("ERROR: MLflow client is not available.")
             print("Please ensure MLflow is properly configured and running.")
@@ -61,8 +105,7 @@ def main():
     # Get list of prompts to register
     prompts = registry.FALLBACK_PROMPTS
     print(f"Found {len(prompts)} prompts to register:")
-    for name in prompts.keys():
-        print(f"  - {name}")
+    print("\n".join(f"  - {name}" for name in prompts.keys()))
     print()
     
     if args.force:
@@ -75,36 +118,33 @@ def main():
     print("Registering prompts...")
     print("-" * 60)
     
+    # Fetch the registered prompt names once up front, so the workers share the cached listing
+    if not args.force:
+        try:
+            registry._get_registered_names()
+        except Exception as e:
+            logger.debug(f"Could not list registered prompts: {e}")
+    
+    # Prompts are independent: register them concurrently, then report in the original order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(
+            lambda item: register_one(registry, item[0], item[1], args.force),
+            prompts.items()
+        ))
+    
     registered_count = 0
     skipped_count = 0
     error_count = 0
     
-    for name, template in prompts.items():
-        try:
-            # Check if prompt exists (only if not forcing)
-            if not args.force and registry._prompt_exists(name):
-                print(f"SKIP:  {name} (already exists)")
-                skipped_count += 1
-                continue
-            
-            # Register the prompt
-            registry.register_prompt_if_missing(
-                name=name,
-                template=template,
-                commit_message="Initial version from codebase" if not args.force else "Updated version from codebase",
-                tags={"source": "codebase", "agent": name},
-                force_update=args.force
-            )
-            
-            if args.force:
-                print(f"UPDATE: {name}")
-            else:
-                print(f"REGISTER: {name}")
-            registered_count += 1
-            
-        except Exception as e:
-            print(f"ERROR:  {name} - {e}")
+    # Write the per-prompt lines in one call rather than one print per prompt
+    print("\n".join(line for _, line in results))
+    for status, _ in results:
+        if status == "skipped":
+            skipped_count += 1
+        elif status == "error":
             error_count += 1
+        else:
+            registered_count += 1
     
     print("-" * 60)
     print()
@@ -1,20 +1,52 @@
 """Remove all prompt versions except the latest one for all registered MLflow prompts."""
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import mlflow
 from mlflow.tracking import MlflowClient
 
-# Add parent directory to sys.path to allow importing app modules
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add parent directory to sys.path to allow importing app modules (only when run by file path;
+# imports and `python -m scripts.remove_prompt_versions` already have it)
+if not __package__:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts._mlflow_common import get_registry
+
+# Concurrent MLflow requests (version lookups and deletions are independent)
+MAX_WORKERS = 16
+
+
+def get_versions(client, name):
+    """Return the sorted version numbers that currently exist for a prompt."""
+    # One listing call instead of load_prompt("@latest"): gives the latest version and
+    # tells which older versions still exist (earlier cleanups may have removed some)
+    versions = []
+    page_token = None
+    while True:
+        page = client.search_prompt_versions(name, page_token=page_token)
+        versions.extend(int(prompt_version.version) for prompt_version in page)
+        page_token = page.token
+        if not page_token:
+            break
+    if not versions:
+        raise ValueError(f"Prompt '{name}' has no versions")
+    return sorted(versions)
+
+
+def delete_version(client, name, version):
+    """Delete one prompt version; return None on success or the error."""
+    try:
+        client.delete_prompt_version(name, version=version)
+        return None
+    except Exception as e:
+        return e
 
-from app.core.prompt_registry import PromptRegistry
 
 def main():
     print("=" * 60)
     print("MLflow Prompt Version Cleanup")
     print("=" * 60)
-    registry = PromptRegistry()
+    registry = get_registry()
     client = registry._client
     if client is None:
         print("MLflow client is not available. Exiting.")
@@ -26,32 +58,48 @@ def main():
         return
     
     print("\nChecking registered prompts:")
-    for name in prompts.keys():
-        print(f"  - {name}")
+    print("\n".join(f"  - {name}" for name in prompts.keys()))
     print()
 
-    for name in prompts.keys():
-        try:
-            prompt_obj = mlflow.genai.load_prompt(f"prompts:/{name}@latest")
-            latest_version = prompt_obj.version
-            print(f"\nPrompt: {name}")
-            print(f"  Latest version: {latest_version}")
-
-            deleted_versions = []
-            # Remove all versions except latest
-            for version in range(1, latest_version):
-                try:
-                    client.delete_prompt_version(name, version=version)
-                    deleted_versions.append(version)
-                except Exception as e:
-                    print(f"    [!] Failed to delete version {version} of '{name}': {e}")
-            if deleted_versions:
-                print(f"  Deleted versions: {', '.join(map(str, deleted_versions))}")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # First pass: list every prompt's versions concurrently
+        lookups = {name: executor.submit(get_versions, client, name) for name in prompts.keys()}
+        prompt_versions = {}
+        for name, future in lookups.items():
+            try:
+                prompt_versions[name] = future.result()
+            except Exception as e:
+                print(f"[ERROR] Failed to process prompt '{name}': {e}")
+        latest_versions = {name: versions[-1] for name, versions in prompt_versions.items()}
+        
+        # Second pass: delete all versions except the latest, across all prompts at once
+        worklist = [
+            (name, version)
+            for name, versions in prompt_versions.items()
+            for version in versions[:-1]
+        ]
+        errors = executor.map(lambda item: delete_version(client, *item), worklist)
+        results = {name: ([], []) for name in latest_versions}  # name -> (deleted, failed)
+        for (name, version), error in zip(worklist, errors):
+            if error is None:
+                results[name][0].append(version)
             else:
-                print(f"  No old versions to delete.")
-
-        except Exception as e:
-            print(f"[ERROR] Failed to process prompt '{name}': {e}")
+                results[name][1].append((version, error))
+    
+    # Report per prompt, in the original order, buffered and written in one call
+    report = []
+    for name, latest_version in latest_versions.items():
+        deleted_versions, failed_versions = results[name]
+        report.append(f"\nPrompt: {name}")
+        report.append(f"  Latest version: {latest_version}")
+        for version, error in failed_versions:
+            report.append(f"    [!] Failed to delete version {version} of '{name}': {error}")
+        if deleted_versions:
+            report.append(f"  Deleted versions: {', '.join(map(str, deleted_versions))}")
+        else:
+            report.append(f"  No old versions to delete.")
+    if report:
+        print("\n".join(report))
 
     print("\nCleanup complete.\n")
 
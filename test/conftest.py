@@ -0,0 +1,13 @@
+import pytest
+from unittest.mock import patch
+
+from app.agents.orchestrator import OrchestratorAgent
+
+
+@pytest.fixture(scope="session")
+def orchestrator():
+    """OrchestratorAgent built once per test session, using the fallback prompts (no MLflow registry lookups)."""
+    with patch("app.core.prompt_registry.mlflow.genai.load_prompt", side_effect=LookupError("registry disabled in tests")):
+        agent = OrchestratorAgent()
+    # Yield outside the patch so it does not stay active for later tests
+    yield agent
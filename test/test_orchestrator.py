@@ -1,9 +1,8 @@
 import pytest
-from app.agents.orchestrator import OrchestratorAgent
 
 @pytest.mark.asyncio
-async def test_orchestrator_agent_init():
-    agent = OrchestratorAgent(model='azure:gpt-5-nano')
+async def test_orchestrator_agent_init(orchestrator):
+    agent = orchestrator
     assert agent is not None
     assert hasattr(agent, "planner_agent")
     assert hasattr(agent, "database_query_agent")
@@ -0,0 +1,95 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+from pydantic_ai import ModelRequest, UserPromptPart
+
+from app.core.models import DatabaseResult, QueryAgentOutput
+from app.utils.routing import Router
+
+
+class FakeQueryAgent:
+    """Stands in for DatabaseQueryAgent, counting model runs."""
+    
+    def __init__(self, db_path, success=True):
+        self.db_tool = SimpleNamespace(db_path=db_path)
+        self.success = success
+        self.calls = 0
+    
+    async def run(self, user_message, message_history=None):
+        self.calls += 1
+        output = QueryAgentOutput(
+            sql_query="SELECT 1",
+            query_result=DatabaseResult(
+                success=self.success,
+                data=[{"1": 1}] if self.success else None,
+                error=None if self.success else "no such table: x"
+            ),
+            explanation="test"
+        )
+        return SimpleNamespace(output=output)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "data.db"
+    path.write_bytes(b"")
+    return path
+
+
+@pytest.mark.asyncio
+async def test_exact_cache_hits_identical_message_and_history(db_path):
+    agent = FakeQueryAgent(db_path)
+    router = Router(agent)
+    history = [ModelRequest(parts=[UserPromptPart(content="earlier question")])]
+    
+    first, _ = await router._execute_query_attempt("how many rows?", history)
+    second, run_result = await router._execute_query_attempt("how many rows?", list(history))
+    
+    assert agent.calls == 1
+    assert second == first
+    assert run_result is None
+
+
+@pytest.mark.asyncio
+async def test_exact_cache_misses_when_history_changes(db_path):
+    agent = FakeQueryAgent(db_path)
+    router = Router(agent)
+    
+    await router._execute_query_attempt("how many rows?", [])
+    await router._execute_query_attempt("how many rows?", [ModelRequest(parts=[UserPromptPart(content="other")])])
+    
+    assert agent.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_exact_cache_skips_failures(db_path):
+    agent = FakeQueryAgent(db_path, success=False)
+    router = Router(agent)
+    
+    await router._execute_query_attempt("how many rows?")
+    await router._execute_query_attempt("how many rows?")
+    
+    assert agent.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_exact_cache_expires_and_invalidates(db_path):
+    agent = FakeQueryAgent(db_path)
+    router = Router(agent)
+    
+    await router._execute_query_attempt("how many rows?")
+    # Reloading the data changes the database file
+    stat = os.stat(db_path)
+    os.utime(db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    await router._execute_query_attempt("how many rows?")
+    assert agent.calls == 2
+    
+    router.clear_cache()
+    await router._execute_query_attempt("how many rows?")
+    assert agent.calls == 3
+    
+    # Every entry is older than a negative TTL
+    router.EXACT_CACHE_TTL = -1.0
+    await router._execute_query_attempt("how many rows?")
+    assert agent.calls == 4
@@ -0,0 +1,150 @@
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+from pydantic_ai import ModelRequest, ModelResponse, SystemPromptPart, TextPart, UserPromptPart
+from pydantic_ai.messages import ModelMessagesTypeAdapter, ToolCallPart, ToolReturnPart
+
+from app.core.models import DatabaseResult, QueryAgentOutput
+from app.db.manager import DatabaseManager
+from app.utils.message_history import messages_from_chat_history
+from app.utils.session_manager import SessionManager
+
+
+def _turn(i):
+    """One user turn with a tool call: request, tool call, tool return, final answer."""
+    return [
+        ModelRequest(parts=[UserPromptPart(content=f"question {i}")]),
+        ModelResponse(parts=[ToolCallPart(tool_name="query_database", args={"sql": "SELECT 1"}, tool_call_id=f"call-{i}")]),
+        ModelRequest(parts=[ToolReturnPart(tool_name="query_database", content="1", tool_call_id=f"call-{i}")]),
+        ModelResponse(parts=[TextPart(content=f"answer {i}")]),
+    ]
+
+
+def _starts_user_turn(message):
+    return isinstance(message, ModelRequest) and any(isinstance(part, UserPromptPart) for part in message.parts)
+
+
+def test_trim_history_keeps_summary_and_cuts_on_user_turn():
+    manager = SessionManager()
+    summary = ModelRequest(parts=[SystemPromptPart(content="[Previous conversation summary]: ...")])
+    history = [summary] + [message for i in range(20) for message in _turn(i)]
+    
+    trimmed = manager._trim_history(history)
+    
+    assert len(trimmed) <= manager.MAX_HISTORY_MESSAGES
+    assert trimmed[0] is summary
+    assert _starts_user_turn(trimmed[1])
+    assert trimmed[-1] is history[-1]
+
+
+def test_trim_history_without_summary_cuts_on_user_turn():
+    manager = SessionManager()
+    # End on a pending question so a plain tail slice would start on a tool call
+    history = [message for i in range(20) for message in _turn(i)] + _turn(20)[:1]
+    
+    trimmed = manager._trim_history(history)
+    
+    assert len(trimmed) <= manager.MAX_HISTORY_MESSAGES
+    assert _starts_user_turn(trimmed[0])
+    assert trimmed[-1] is history[-1]
+
+
+def test_trim_history_within_bounds_is_unchanged():
+    manager = SessionManager()
+    history = _turn(0)
+    
+    assert manager._trim_history(history) is history
+
+
+def test_identical_chat_histories_give_identical_prompt_prefix(tmp_path):
+    db = DatabaseManager(str(tmp_path / "app.db"))
+    user_id = db.create_user("tester")
+    chat_ids = [db.create_chat_session(user_id), db.create_chat_session(user_id)]
+    for i in range(5):
+        for chat_id in chat_ids:
+            db.create_chat_message(user_id, chat_id, f"question {i}", f"answer {i}")
+    # Messages written within the same second share created_at; id must keep their order stable
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("UPDATE chat_messages SET created_at = '2026-01-01 12:00:00'")
+    
+    prefixes = []
+    for chat_id in chat_ids:
+        manager = SessionManager(db)
+        history = messages_from_chat_history(db.get_chat_history(user_id, chat_id))
+        assert [message.parts[0].content for message in history[::2]] == [f"question {i}" for i in range(5)]
+        session_state = manager.get_or_create_session(f"chat_session_{chat_id}", history)
+        prefixes.append(ModelMessagesTypeAdapter.dump_json(session_state["message_history"]))
+    
+    assert prefixes[0] == prefixes[1]
+
+
+def _query_output(rows):
+    return QueryAgentOutput(
+        sql_query="SELECT * FROM iris",
+        query_result=DatabaseResult(success=True, data=[{"id": i, "species": "setosa"} for i in range(rows)], row_count=rows),
+        explanation="test"
+    )
+
+
+@pytest.mark.asyncio
+async def test_session_round_trip_through_database(tmp_path):
+    db = DatabaseManager(str(tmp_path / "app.db"))
+    manager = SessionManager(db)
+    manager.get_or_create_session("s1", _turn(0) + _turn(1))
+    manager.store_query_result("s1", "small", _query_output(1))
+    manager.store_query_result("s1", "large", _query_output(500))
+    assert isinstance(manager.get_session_state("s1")["cached_query_results"]["large"], bytes)
+    manager.save_session("s1")
+    
+    # Evict, then reload from the database
+    original = manager._session_state.pop("s1")
+    await manager.load_session("s1")
+    reloaded = manager.get_or_create_session("s1")
+    
+    assert ModelMessagesTypeAdapter.dump_json(reloaded["message_history"]) == ModelMessagesTypeAdapter.dump_json(original["message_history"])
+    assert list(reloaded["cached_query_results"]) == ["small", "large"]
+    # Compressed results are stored and restored as-is
+    assert reloaded["cached_query_results"]["large"] == original["cached_query_results"]["large"]
+    assert manager.get_query_result("s1", "small") == _query_output(1)
+    assert manager.get_latest_query_result("s1") == _query_output(500)
+
+
+def test_save_session_skips_unchanged_state(tmp_path):
+    db = DatabaseManager(str(tmp_path / "app.db"))
+    manager = SessionManager(db)
+    session_state = manager.get_or_create_session("s1", _turn(0))
+    
+    with patch.object(db, "save_orchestrator_session", wraps=db.save_orchestrator_session) as save:
+        manager.save_session("s1")
+        manager.save_session("s1")
+        assert save.call_count == 1
+        
+        session_state["message_history"].extend(_turn(1))
+        manager.save_session("s1")
+        assert save.call_count == 2
+
+
+
+@pytest.mark.asyncio
+async def test_load_session_reads_new_session_once(tmp_path):
+    db = DatabaseManager(str(tmp_path / "app.db"))
+    manager = SessionManager(db)
+    history = _turn(0)
+    
+    with patch.object(db, "get_orchestrator_session", wraps=db.get_orchestrator_session) as read:
+        await manager.load_session("new")
+        session_state = manager.get_or_create_session("new", history)
+    
+    assert read.call_count == 1
+    assert session_state["message_history"] is history
+
+
+def test_query_result_is_stored_once_and_reachable_as_latest():
+    manager = SessionManager()
+    manager.store_query_result("s1", "first", _query_output(1))
+    manager.store_query_result("s1", "second", _query_output(2))
+    
+    assert list(manager.get_session_state("s1")["cached_query_results"]) == ["first", "second"]
+    assert manager.get_query_result("s1", "latest") == _query_output(2)
+    assert manager.get_latest_query_result("s1") == _query_output(2)